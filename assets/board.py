@@ -0,0 +1,131 @@
+import os
+try:
+    import streamlit as st
+    import streamlit.components.v1 as components
+except ImportError:
+    # For handling LSP checks where streamlit might not be available
+    pass
+from game_logic import SUITS, FINISH_LINE, CHECKPOINTS
+from assets.card_images import get_card_image, get_card_back
+from assets.team_logos import get_team_logo
+
+# Number of track positions, from the start (0) to the finish line
+TRACK_LENGTH = FINISH_LINE + 1
+
+# Layout of the board: one grid column per track position, a header row for
+# the checkpoints and one row per racecar
+BOARD_CSS = f"""<style>
+.race-board {{ display: grid; grid-template-columns: repeat({TRACK_LENGTH}, minmax(0, 1fr)); gap: 4px; align-items: center; justify-items: center; }}
+.race-board > div {{ min-height: 40px; display: flex; align-items: center; justify-content: center; }}
+.race-board img, .race-board svg {{ max-width: 100%; height: auto; }}
+.race-board .vertical {{ transform: rotate(90deg); }}
+</style>"""
+
+def render_board(game_state, horse_names):
+    """
+    Renders the whole track (checkpoints, their cards and the racecars) as one HTML element.
+
+    Racecars are placed on the grid by row and column, so empty track
+    positions add nothing to the markup.
+
+    Args:
+        game_state (GameState): Current game state
+        horse_names (dict): Suit -> racecar name
+
+    Returns:
+        str: HTML for the board
+    """
+    cells = ['<div style="grid-row:1;grid-column:1">Start</div>']
+
+    for checkpoint in range(1, FINISH_LINE):
+        # Checkpoints 4, 8 and 12 are vertical and shown sideways
+        rotation = " vertical" if CHECKPOINTS[checkpoint] == "vertical" else ""
+
+        if game_state.is_flipped(checkpoint):
+            card = game_state.checkpoint_card(checkpoint)
+            content = "" if card is None else get_card_image(card, horse_names, compact=True)
+        else:
+            # Card back with racecar design for checkpoints not yet flipped
+            content = get_card_back()
+
+        cells.append(
+            f'<div id="checkpoint-{checkpoint}" class="checkpoint-card{rotation}" '
+            f'style="grid-row:1;grid-column:{checkpoint + 1}">{content}</div>'
+        )
+
+    cells.append(f'<div style="grid-row:1;grid-column:{TRACK_LENGTH}">Finish</div>')
+
+    # One row per racecar, with its logo at its position
+    for row, (suit, position) in enumerate(zip(SUITS, game_state.positions), start=2):
+        logo = get_team_logo(suit, horse_names.get(suit, suit))
+        cells.append(
+            f'<div id="horse-{suit}" class="horse" '
+            f'style="grid-row:{row};grid-column:{position + 1}">{logo}</div>'
+        )
+
+    return f'{BOARD_CSS}<div class="race-board">{"".join(cells)}</div>'
+
+# Frontend of the board component, kept in the browser between reruns
+BOARD_COMPONENT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'board_component')
+_board_component = components.declare_component("race_board", path=BOARD_COMPONENT_DIR)
+
+def board_events(events, horse_names):
+    """
+    Converts animation events into the short form the board component plays.
+    
+    Card draws are left out (the drawn card is shown in the game status), and
+    a checkpoint flip is sent with the card revealed for it.
+    
+    Args:
+        events (list): Animation events from the game's EventLog
+        horse_names (dict): Suit -> racecar name, used in card titles
+        
+    Returns:
+        list: ["move", suit, position] and ["flip", checkpoint, card HTML] entries
+    """
+    board = []
+    for event in events:
+        if event["event"] == "move":
+            board.append(["move", event["suit"], event["to_position"]])
+        elif event["event"] == "reveal_card":
+            card_html = get_card_image(event["card"], horse_names, compact=True)
+            board.append(["flip", event["checkpoint_position"], card_html])
+    return board
+
+def race_board(game_state, horse_names, key="race_board"):
+    """
+    Shows the board in a component that keeps its DOM in the browser.
+    
+    The component gets a full snapshot of the board when it has none for this
+    game, and afterwards only the events since the last sequence number sent
+    to it, which it animates locally. If the frame was remounted or missed
+    events, it asks for a new snapshot by setting its value.
+    
+    Args:
+        game_state (GameState): Current game state
+        horse_names (dict): Suit -> racecar name
+        key (str): Component key
+    """
+    log = game_state.animation_events
+    sent = st.session_state.get("animation_ack", 0)
+    
+    # A new resync request from the frontend, a new game, or evicted events
+    request = st.session_state.get(key)
+    resync = request is not None and request != st.session_state.get("board_resync")
+    snapshot = (
+        resync
+        or st.session_state.get("board_game") is not game_state
+        or log is None
+        or log.last_seq - sent > len(log)
+    )
+    
+    seq = log.last_seq if log is not None else 0
+    if snapshot:
+        args = {"seq": seq, "board": render_board(game_state, horse_names)}
+        st.session_state.board_game = game_state
+        st.session_state.board_resync = request
+    else:
+        args = {"seq": seq, "from": sent, "events": board_events(log.since(sent), horse_names)}
+    
+    st.session_state.animation_ack = seq
+    _board_component(key=key, default=None, **args)
@@ -1,47 +1,39 @@
 import os
-import base64
-from PIL import Image
-import io
+import html
+import threading
+from assets.thumbnails import thumbnails, picture_tag
+from game_logic import card_suit, card_value, CARDS_PER_SUIT
 
-def get_card_image(card_name, custom_suit_names=None):
+# Card value index -> display text
+CARD_VALUE_LABELS = ["2", "3", "4", "5", "6", "7", "8", "9", "10", "J", "Q", "K"]
+
+# Map suit to symbol and color
+SUIT_SYMBOLS = {
+    "hearts": ("♥", "red"),
+    "diamonds": ("♦", "red"),
+    "clubs": ("♣", "black"),
+    "spades": ("♠", "black")
+}
+
+# Placeholder for the card title, filled in per call
+_TITLE_SLOT = "\0"
+
+def _render_card_svg(card):
     """
-    Returns an SVG representation of a playing card.
+    Renders the SVG of a card with a placeholder for its title.
     
     Args:
-        card_name (str): Card name in format "value of suit" (e.g., "jack of hearts")
-        custom_suit_names (dict, optional): Dictionary mapping suit names to custom names
+        card (int): Card as stored in the deck
         
     Returns:
-        str: SVG image of the card as HTML
+        str: SVG image of the card
     """
-    parts = card_name.split(" of ")
-    if len(parts) != 2:
-        return "<p>Invalid card name</p>"
-    
-    value, suit = parts
-    suit_lower = suit.lower()
-    
-    # Map card value to display text
-    value_map = {
-        "2": "2", "3": "3", "4": "4", "5": "5", "6": "6", "7": "7", 
-        "8": "8", "9": "9", "10": "10", "jack": "J", "queen": "Q", 
-        "king": "K", "ace": "A"
-    }
-    
-    # Map suit to symbol and color
-    suit_map = {
-        "hearts": ("♥", "red"),
-        "diamonds": ("♦", "red"),
-        "clubs": ("♣", "black"),
-        "spades": ("♠", "black")
-    }
-    
-    display_value = value_map.get(value.lower(), value)
-    suit_symbol, color = suit_map.get(suit_lower, ("?", "black"))
-    
-    # Create an SVG card
-    svg = f"""
+    display_value = CARD_VALUE_LABELS[card % CARDS_PER_SUIT]
+    suit_symbol, color = SUIT_SYMBOLS[card_suit(card)]
+    
+    return f"""
     <svg width="80" height="120" viewBox="0 0 80 120" xmlns="http://www.w3.org/2000/svg">
+        <title>{_TITLE_SLOT}</title>
         <rect x="0" y="0" width="80" height="120" rx="10" ry="10" fill="white" stroke="black" stroke-width="1"/>
         <text x="10" y="25" font-family="Arial" font-size="20" fill="{color}">{display_value}</text>
         <text x="10" y="50" font-family="Arial" font-size="30" fill="{color}">{suit_symbol}</text>
@@ -49,42 +41,141 @@ def get_card_image(card_name, custom_suit_names=None):
         <text x="70" y="115" font-family="Arial" font-size="20" text-anchor="end" fill="{color}">{display_value}</text>
     </svg>
     """
+
+def _compact(svg):
+    """Strips the indentation and line breaks from an SVG string."""
+    return "".join(line.strip() for line in svg.splitlines())
+
+# SVG of every card, split around the title: card -> (before, after)
+CARD_SVGS = tuple(
+    tuple(_render_card_svg(card).split(_TITLE_SLOT))
+    for card in range(len(SUIT_SYMBOLS) * CARDS_PER_SUIT)
+)
+CARD_SVGS_COMPACT = tuple(
+    tuple(_compact(_render_card_svg(card)).split(_TITLE_SLOT))
+    for card in range(len(SUIT_SYMBOLS) * CARDS_PER_SUIT)
+)
+
+def get_card_image(card, custom_suit_names=None, compact=False):
+    """
+    Returns an SVG representation of a playing card.
     
-    return svg
+    The SVGs are rendered once at import; each call only fills in the card's
+    title (shown as a tooltip), which uses the custom suit name if given.
+    
+    Args:
+        card (int): Card as stored in the deck (see game_logic.card_name)
+        custom_suit_names (dict, optional): Dictionary mapping suit names to custom names
+        compact (bool): Whether to return the SVG without extra whitespace
+        
+    Returns:
+        str: SVG image of the card as HTML
+    """
+    before, after = (CARD_SVGS_COMPACT if compact else CARD_SVGS)[card]
+    
+    suit = card_suit(card)
+    if custom_suit_names:
+        suit = custom_suit_names.get(suit, suit)
+    
+    return f"{before}{html.escape(f'{card_value(card)} of {suit}')}{after}"
+
+# Path to the McLaren F1 image used on card backs
+CARD_BACK_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                              'attached_assets', 'aifaceswap-a73a29c5f276f2ab1862c31fb0f3cd7d.jpg')
+
+# Size the card back is shown at, in CSS pixels
+CARD_BACK_SIZE = (80, 120)
+
+# Rendered card back shared by all sessions: (source signature, HTML)
+_card_back = None
+_card_back_lock = threading.Lock()
+
+def _source_signature(path):
+    """
+    Returns a signature that changes whenever the file at path changes.
+    
+    Args:
+        path (str): File path
+        
+    Returns:
+        tuple: (modification time in ns, size), or None if the file is missing
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
 
 def get_card_back():
     """
-    Returns an HTML img element with the McLaren F1 image as a base64-encoded source.
+    Returns an HTML element with the McLaren F1 image.
+    
+    The element is built once per process and reused by every session until
+    the source file changes. The image comes from the thumbnail cache at
+    display size; it is served as static files when static serving is
+    enabled, and inlined as base64 otherwise.
     
     Returns:
-        str: HTML img element with the McLaren F1 image
+        str: HTML element with the McLaren F1 image
+    """
+    global _card_back
+    
+    signature = _source_signature(CARD_BACK_PATH)
+    cached = _card_back
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    
+    with _card_back_lock:
+        if _card_back is None or _card_back[0] != signature:
+            _card_back = (signature, _card_back_html(CARD_BACK_PATH))
+        return _card_back[1]
+
+def card_back(source, size):
     """
-    # Path to the McLaren F1 image
-    image_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 
-                             'attached_assets', 'aifaceswap-a73a29c5f276f2ab1862c31fb0f3cd7d.jpg')
+    Thumbnail recipe for the card back: the photo squared and centered on an orange card.
     
-    # Open and resize the image
+    Args:
+        source (PIL.Image.Image): McLaren F1 image
+        size (tuple): Card (width, height) in pixels
+        
+    Returns:
+        PIL.Image.Image: Card back
+    """
+    from PIL import Image
+    
+    # Resize to the card width while keeping the photo square
+    width, height = size
+    img = source.convert('RGB').resize((width, width), Image.Resampling.LANCZOS)
+    
+    # Center the F1 image on an orange card
+    card_img = Image.new('RGB', size, color=(255, 128, 0))
+    card_img.paste(img, (0, (height - width) // 2))
+    return card_img
+
+def card_back_thumbnails(image_path=CARD_BACK_PATH):
+    """
+    Returns the card back at display size, from the thumbnail cache.
+    
+    Args:
+        image_path (str): Path to the McLaren F1 image
+        
+    Returns:
+        list: Thumbnail variants (see assets.thumbnails)
+    """
+    return thumbnails(image_path, CARD_BACK_SIZE, recipe=card_back, fallback="jpeg")
+
+def _card_back_html(image_path):
+    """
+    Builds the card back HTML from the source image.
+    
+    Args:
+        image_path (str): Path to the McLaren F1 image
+        
+    Returns:
+        str: HTML element with the card back, or an SVG fallback if the image can't be loaded
+    """
     try:
-        with Image.open(image_path) as img:
-            # Resize to appropriate card dimensions while maintaining aspect ratio
-            img = img.resize((80, 80), Image.Resampling.LANCZOS)
-            
-            # Create a new image with card proportions (80x120)
-            card_img = Image.new('RGB', (80, 120), color=(255, 128, 0))  # Orange background
-            
-            # Calculate position to center the F1 image on the card
-            position = ((80 - img.width) // 2, (120 - img.height) // 2)
-            
-            # Paste the resized F1 image onto the card
-            card_img.paste(img, position)
-            
-            # Convert the image to base64 encoded string
-            buffered = io.BytesIO()
-            card_img.save(buffered, format="JPEG")
-            img_str = base64.b64encode(buffered.getvalue()).decode()
-            
-            # Return the image as an HTML img element
-            return f'<img src="data:image/jpeg;base64,{img_str}" width="80" height="120" style="border-radius: 10px;">'
+        variants = card_back_thumbnails(image_path)
     except Exception as e:
         # Fallback if there's an error loading the image
         print(f"Error loading card back image: {e}")
@@ -94,3 +185,6 @@ def get_card_back():
             <text x="40" y="60" font-family="Arial" font-size="10" text-anchor="middle" fill="#000000">McLaren F1</text>
         </svg>
         """
+    
+    start, end = picture_tag("card-back", variants, style="border-radius: 10px;", fallback="jpeg")
+    return f"{start}McLaren F1{end}"
@@ -0,0 +1,326 @@
+import html
+try:
+    import streamlit as st
+except ImportError:
+    # For handling LSP checks where streamlit might not be available
+    pass
+from game_logic import SUITS
+
+# Players shown per page of the in-game player table
+PLAYERS_PER_PAGE = 25
+
+def _editor_key():
+    """
+    Returns the key of the current player editor.
+
+    The key changes after every applied batch of edits, so the editor starts
+    from the updated player list instead of replaying its old edits on it.
+    """
+    return f"player_editor_{st.session_state.get('player_editor_version', 0)}"
+
+def _valid_stakes(value):
+    """
+    Returns stakes entered in the editor as an int, or None if they aren't valid.
+    """
+    try:
+        stakes = int(value)
+    except (TypeError, ValueError):
+        return None
+    return stakes if stakes >= 1 else None
+
+def _apply_player_edits(key, players, horse_names, revision, lock):
+    """
+    Applies one batch of edits from the player editor to the player list.
+
+    Called by the editor before the rerun, with every row edited, added and
+    removed since the editor was created. Rows with invalid values keep
+    their old values; added rows without a name are dropped. The roster
+    keeps its per-racecar stake totals up to date as the batch is applied.
+
+    Rows are positions in the roster as the editor showed it. If someone
+    else at the table changed the players since, the positions no longer
+    hold, so the batch is dropped and the editor starts over from the
+    current players.
+
+    Args:
+        key (str): Key of the editor whose changes are applied
+        players (PlayerRoster): Players the editor shows
+        horse_names (dict): Suit -> racecar name
+        revision (int): Revision of the roster the editor was created from
+        lock (threading.RLock): Lock of the table the players are at
+    """
+    changes = st.session_state[key]
+    suit_by_name = {name: suit for suit, name in horse_names.items()}
+
+    with lock:
+        if players.revision != revision:
+            st.session_state.player_edits_dropped = True
+        else:
+            for row, edits in changes["edited_rows"].items():
+                players.update(
+                    int(row),
+                    name=edits.get("Name") or None,
+                    suit=suit_by_name.get(edits.get("Racecar")),
+                    stakes=_valid_stakes(edits.get("Stakes"))
+                )
+
+            for row in sorted(changes["deleted_rows"], reverse=True):
+                players.remove(int(row))
+
+            for added in changes["added_rows"]:
+                if added.get("Name"):
+                    players.add(
+                        added["Name"],
+                        suit_by_name.get(added.get("Racecar"), SUITS[0]),
+                        _valid_stakes(added.get("Stakes")) or 1
+                    )
+
+    st.session_state.player_editor_version = st.session_state.get("player_editor_version", 0) + 1
+
+def player_editor(players, horse_names, lock):
+    """
+    Shows every player in one editable table during setup.
+
+    Racecars and stakes can be edited in place, and rows added or removed;
+    all of it is applied as one batch when the editor reports a change.
+
+    Args:
+        players (PlayerRoster): Players of the table
+        horse_names (dict): Suit -> racecar name
+        lock (threading.RLock): Lock of the table, held while the edits are applied
+    """
+    # Only needed once there are players to edit
+    import pandas as pd
+
+    if st.session_state.pop("player_edits_dropped", False):
+        st.warning("The players changed while you were editing, so your last edit was not applied.")
+
+    key = _editor_key()
+    # The rows and the revision they belong to are read in one go
+    with lock:
+        revision = players.revision
+        table = pd.DataFrame({
+            "Name": [player["name"] for player in players],
+            "Racecar": [horse_names[player["horse"]] for player in players],
+            "Stakes": [player["stakes"] for player in players],
+        })
+
+    st.data_editor(
+        table,
+        key=key,
+        on_change=_apply_player_edits,
+        args=(key, players, horse_names, revision, lock),
+        num_rows="dynamic",
+        hide_index=True,
+        column_config={
+            "Name": st.column_config.TextColumn("Name", required=True),
+            "Racecar": st.column_config.SelectboxColumn(
+                "Racecar", options=[horse_names[suit] for suit in SUITS], required=True
+            ),
+            "Stakes": st.column_config.NumberColumn(
+                "Stakes (Slurker)", min_value=1, step=1, format="%d", required=True
+            ),
+        },
+    )
+
+def player_list(players, horse_names, positions, logo):
+    """
+    Shows the players during a game as one HTML table, a page at a time.
+
+    Args:
+        players (PlayerRoster): Players of the session
+        horse_names (dict): Suit -> racecar name
+        positions (dict): Suit -> track position
+        logo (callable): Returns the logo HTML for a suit
+    """
+    pages = (len(players) - 1) // PLAYERS_PER_PAGE + 1
+    page = 1
+    if pages > 1:
+        # Keep the page in range when the party got smaller since the last game
+        if st.session_state.get("player_page", 1) > pages:
+            st.session_state.player_page = pages
+        page = st.number_input(
+            f"Page (of {pages})", min_value=1, max_value=pages, step=1, key="player_page"
+        )
+
+    start = (page - 1) * PLAYERS_PER_PAGE
+    rows = "".join(
+        f"<tr><td>{html.escape(player['name'])}</td>"
+        f"<td>{logo(player['horse'])} {html.escape(horse_names[player['horse']])}</td>"
+        f"<td>{player['stakes']}</td><td>{positions[player['horse']]}</td></tr>"
+        for player in players[start:start + PLAYERS_PER_PAGE]
+    )
+
+    st.markdown(
+        '<table style="width:100%"><thead><tr><th>Name</th><th>Racecar</th>'
+        f'<th>Stakes</th><th>Position</th></tr></thead><tbody>{rows}</tbody></table>',
+        unsafe_allow_html=True
+    )
+
+# Columns of the player CSV files, in order
+CSV_COLUMNS = ["name", "team", "stakes"]
+
+# Import problems listed before the rest are summarised as a count
+MAX_LISTED_PROBLEMS = 10
+
+# Highest stakes accepted from an imported list
+MAX_STAKES = 1000
+
+def parse_players_csv(text, horse_names, existing_names=()):
+    """
+    Parses and validates a player list in CSV form.
+
+    Each column is checked in one pass over the whole file: empty names,
+    teams that are neither a racecar name nor a suit, stakes that aren't
+    whole numbers from 1 to MAX_STAKES, and names used twice in the file or
+    by a player already in the game. Names and teams are matched
+    case-insensitively.
+
+    Args:
+        text (str): CSV with a header row and the columns name, team, stakes
+        horse_names (dict): Suit -> racecar name
+        existing_names (iterable): Names of players already in the game
+
+    Returns:
+        tuple: (list of (name, suit, stakes) rows, list of problems); rows is
+            empty whenever there are problems
+    """
+    import io
+    import pandas as pd
+
+    try:
+        table = pd.read_csv(io.StringIO(text), dtype=str, keep_default_na=False, skip_blank_lines=True)
+    except (pd.errors.ParserError, pd.errors.EmptyDataError) as e:
+        return [], [f"Could not read the CSV: {e}"]
+
+    table.columns = table.columns.str.strip().str.lower()
+    missing = [column for column in CSV_COLUMNS if column not in table.columns]
+    if missing:
+        return [], [f"Missing column(s): {', '.join(missing)}"]
+
+    suit_by_team = {name.strip().casefold(): suit for suit, name in horse_names.items()}
+    suit_by_team.update({suit: suit for suit in horse_names})
+
+    names = table["name"].str.strip()
+    folded = names.str.casefold()
+    teams = table["team"].str.strip()
+    suits = teams.str.casefold().map(suit_by_team)
+    stakes = pd.to_numeric(table["stakes"].str.strip(), errors="coerce")
+
+    checks = {
+        "empty name": names == "",
+        "unknown team": suits.isna(),
+        "stakes must be a whole number of at least 1": stakes.isna() | (stakes < 1) | (stakes % 1 != 0),
+        f"stakes must be at most {MAX_STAKES}": stakes > MAX_STAKES,
+        "name used more than once": folded.duplicated(keep=False) & (names != ""),
+        "name already taken": folded.isin({name.casefold() for name in existing_names}),
+    }
+
+    problems = []
+    for message, failed in checks.items():
+        # Rows are numbered as in a spreadsheet, with the header on line 1
+        for row in failed[failed].index:
+            problems.append((row + 2, f"line {row + 2}: {message}"))
+    problems = [problem for _, problem in sorted(problems)]
+    if len(problems) > MAX_LISTED_PROBLEMS:
+        problems = problems[:MAX_LISTED_PROBLEMS] + [f"... and {len(problems) - MAX_LISTED_PROBLEMS} more"]
+    if problems:
+        return [], problems
+
+    return list(zip(names, suits, stakes.astype(int))), []
+
+def decode_csv(data):
+    """
+    Decodes an uploaded CSV file.
+
+    Files are read as UTF-8 (with or without a byte order mark), falling
+    back to Windows-1252, which spreadsheet programs often export in.
+
+    Args:
+        data (bytes): File contents
+
+    Returns:
+        str: Decoded text
+
+    Raises:
+        UnicodeDecodeError: If the file is in neither encoding
+    """
+    try:
+        return data.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        return data.decode("cp1252")
+
+def players_csv(players, horse_names):
+    """
+    Returns the players as CSV, in the format ``parse_players_csv`` reads.
+
+    Args:
+        players (PlayerRoster): Players of the session
+        horse_names (dict): Suit -> racecar name
+
+    Returns:
+        str: CSV with a header row
+    """
+    import pandas as pd
+
+    return pd.DataFrame({
+        "name": [player["name"] for player in players],
+        "team": [horse_names[player["horse"]] for player in players],
+        "stakes": [player["stakes"] for player in players],
+    }, columns=CSV_COLUMNS).to_csv(index=False)
+
+def player_import_export(players, horse_names, lock):
+    """
+    Shows the bulk import and export of the player list during setup.
+
+    A CSV file or pasted text is validated as a whole and, if it has no
+    problems, added to the players in one step.
+
+    Args:
+        players (PlayerRoster): Players of the table
+        horse_names (dict): Suit -> racecar name
+        lock (threading.RLock): Lock of the table, held while the players are added
+
+    Returns:
+        bool: True if players were imported and the page should be rerun
+    """
+    with st.expander("Import / export players"):
+        st.caption("CSV with the columns name, team and stakes. Team is a racecar name or a suit.")
+        uploaded = st.file_uploader("Player list", type=["csv", "txt"], key="player_csv_file")
+        pasted = st.text_area("Or paste it here", key="player_csv_text",
+                              placeholder="name,team,stakes\nAlice,McLaren,2")
+        replace = st.checkbox("Replace the current players", key="player_csv_replace")
+
+        imported = False
+        if st.button("Import players"):
+            existing = () if replace else (player["name"] for player in players)
+            try:
+                text = decode_csv(uploaded.getvalue()) if uploaded is not None else pasted
+            except UnicodeDecodeError as e:
+                rows, problems = [], [f"Could not read the CSV: {e}"]
+            else:
+                rows, problems = parse_players_csv(text, horse_names, existing)
+
+            if problems:
+                st.error("Nothing imported:\n\n" + "\n".join(f"- {problem}" for problem in problems))
+            elif not rows:
+                st.warning("The player list is empty.")
+            else:
+                with lock:
+                    if replace:
+                        players.clear()
+                    for name, suit, stakes in rows:
+                        players.add(name, suit, stakes)
+                # Start the editor from the new list
+                st.session_state.player_editor_version = st.session_state.get("player_editor_version", 0) + 1
+                imported = True
+
+        if players:
+            st.download_button(
+                "Export players",
+                data=players_csv(players, horse_names),
+                file_name="players.csv",
+                mime="text/csv"
+            )
+
+    return imported
@@ -0,0 +1,87 @@
+import os
+import base64
+import glob
+import hashlib
+import threading
+
+# Folder Streamlit serves at app/static/ when server.enableStaticServing is on
+STATIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'static')
+STATIC_ROUTE = 'app/static'
+
+# Files written to STATIC_DIR by this process
+_published = set()
+_publish_lock = threading.Lock()
+
+def static_serving_enabled():
+    """
+    Returns whether Streamlit serves the static folder.
+
+    Returns:
+        bool: True if server.enableStaticServing is set
+    """
+    try:
+        import streamlit as st
+        return bool(st.get_option("server.enableStaticServing"))
+    except Exception:
+        return False
+
+def asset_url(name, data, extension, mime_type):
+    """
+    Returns a URL for an image, served as a browser-cacheable static file when possible.
+
+    With static serving on, the bytes are written once to the static folder
+    under a content-hashed name, so the URL changes whenever the content
+    does and browsers can keep it cached. Older versions of the same asset
+    are removed. Otherwise the image is inlined as a data URI.
+
+    Args:
+        name (str): Asset name used as the file name prefix, e.g. "card-back"
+        data (bytes): Encoded image
+        extension (str): File extension, e.g. "jpg"
+        mime_type (str): MIME type for the data URI fallback, e.g. "image/jpeg"
+
+    Returns:
+        str: Relative static URL or data URI
+    """
+    if not static_serving_enabled():
+        return f"data:{mime_type};base64,{base64.b64encode(data).decode()}"
+
+    filename = f"{name}-{hashlib.sha256(data).hexdigest()[:16]}.{extension}"
+
+    with _publish_lock:
+        if filename not in _published:
+            try:
+                _write_static_file(name, filename, extension, data)
+            except OSError as e:
+                print(f"Error writing static asset {filename}: {e}")
+                return f"data:{mime_type};base64,{base64.b64encode(data).decode()}"
+            _published.add(filename)
+
+    return f"{STATIC_ROUTE}/{filename}"
+
+def _write_static_file(name, filename, extension, data):
+    """
+    Writes an asset to the static folder and removes older versions of it.
+
+    Args:
+        name (str): Asset name prefix
+        filename (str): Content-hashed file name
+        extension (str): File extension
+        data (bytes): File contents
+    """
+    path = os.path.join(STATIC_DIR, filename)
+    if not os.path.exists(path):
+        os.makedirs(STATIC_DIR, exist_ok=True)
+        # Write to a temporary file first so the server never serves a partial file
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as static_file:
+            static_file.write(data)
+        os.replace(temp_path, path)
+
+    versions = f"{glob.escape(name)}-{'[0-9a-f]' * 16}.{extension}"
+    for old_path in glob.glob(os.path.join(STATIC_DIR, versions)):
+        if os.path.basename(old_path) != filename:
+            try:
+                os.remove(old_path)
+            except OSError:
+                pass
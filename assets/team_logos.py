@@ -0,0 +1,68 @@
+import os
+import html
+from functools import lru_cache
+from assets.thumbnails import thumbnails, picture_tag
+
+# Map suits to racing team image files
+TEAM_IMAGES = {
+    'hearts': 'mclaren.avif',
+    'diamonds': 'mercedes.avif',
+    'clubs': 'ferrari.avif',
+    'spades': 'red-bull-racing.avif'
+}
+
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'attached_assets')
+
+# Box the logos are shown in, in CSS pixels
+LOGO_SIZE = (100, 40)
+
+def team_logo_thumbnails():
+    """
+    Returns every team logo at display size, from the thumbnail cache.
+
+    Returns:
+        dict: Suit -> thumbnail variants; suits whose image can't be loaded are left out
+    """
+    logos = {}
+    for suit, filename in TEAM_IMAGES.items():
+        try:
+            logos[suit] = thumbnails(os.path.join(ASSETS_DIR, filename), LOGO_SIZE)
+        except Exception as e:
+            print(f"Error loading image for {suit}: {e}")
+    return logos
+
+@lru_cache(maxsize=None)
+def team_logo_registry():
+    """
+    Loads every team logo once per process and pre-builds its img tag.
+
+    Logos are display-size thumbnails, referenced as static files when
+    static serving is enabled and inlined as base64 otherwise. Each tag is
+    stored as the part before and after the alt text, so per-session
+    racecar names only fill in the alt attribute.
+
+    Returns:
+        dict: Suit -> (tag start, tag end); suits whose image can't be loaded are left out
+    """
+    return {
+        suit: picture_tag(f"team-{suit}", variants, style="max-width:100px; max-height:40px;")
+        for suit, variants in team_logo_thumbnails().items()
+    }
+
+def get_team_logo(suit, name):
+    """
+    Returns an HTML element with the racing team logo for a suit.
+
+    Args:
+        suit (str): Card suit (hearts, diamonds, clubs, spades)
+        name (str): Racecar name, used as alt text
+
+    Returns:
+        str: HTML element, or the name itself if there is no logo
+    """
+    tag = team_logo_registry().get(suit)
+    if tag is None:
+        # Fallback to displaying the team name as text
+        return name
+
+    return f"{tag[0]}{html.escape(name)}{tag[1]}"
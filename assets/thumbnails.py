@@ -0,0 +1,277 @@
+"""
+Display-size thumbnails for the images the app shows.
+
+Source images are far larger than they are displayed, so each one is
+rendered at its display size and at 2x for high-density screens, in AVIF,
+WebP and a fallback format browsers always support. Thumbnails are kept in
+a content-addressed cache on disk, keyed by the source bytes, the recipe
+that renders them, the target size and the format, so they are encoded
+once and a changed source never reuses a stale file.
+
+The cache is committed with the repository, so a deployed app only reads
+files and needs no Pillow for its images. Rebuild it and drop unused
+entries after changing a source or a recipe:
+
+    python -m assets.thumbnails
+"""
+import os
+import html
+import hashlib
+import threading
+from collections import namedtuple
+from assets.static_assets import asset_url, static_serving_enabled
+
+# Folder the encoded thumbnails are cached in
+THUMBNAIL_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'thumbnails')
+
+# Bump when the encoding settings change, so cached thumbnails are rebuilt
+PIPELINE_VERSION = 1
+
+# Pixel densities every thumbnail is rendered at
+SCALES = (1, 2)
+
+# Format -> (file extension, MIME type, Pillow save options)
+FORMATS = {
+    "avif": ("avif", "image/avif", {"quality": 60}),
+    "webp": ("webp", "image/webp", {"quality": 80, "method": 6}),
+    "png": ("png", "image/png", {"optimize": True}),
+    "jpeg": ("jpg", "image/jpeg", {"quality": 85, "optimize": True, "progressive": True}),
+}
+
+# Formats tried before the fallback; browsers that can't show them skip them
+MODERN_FORMATS = ("avif", "webp")
+
+# One encoded image of a thumbnail
+Variant = namedtuple("Variant", ["format", "scale", "data"])
+
+# Cache file names read or written by this process, kept by a rebuild
+_used = set()
+_used_lock = threading.Lock()
+
+# Encoded image hash -> pixel size, so cached thumbnails are sized once
+_sizes = {}
+
+def _cache_path(source_hash, recipe, size, fmt):
+    """
+    Returns the cache file of a thumbnail.
+
+    Args:
+        source_hash (str): SHA-256 of the source image
+        recipe (str): Name of the function that renders the thumbnail
+        size (tuple): Target (width, height) in pixels
+        fmt (str): Key of FORMATS
+
+    Returns:
+        str: Path in THUMBNAIL_CACHE_DIR
+    """
+    key = f"{PIPELINE_VERSION}:{source_hash}:{recipe}:{size[0]}x{size[1]}:{fmt}"
+    digest = hashlib.sha256(key.encode()).hexdigest()[:24]
+    return os.path.join(THUMBNAIL_CACHE_DIR, f"{digest}.{FORMATS[fmt][0]}")
+
+def _encode(image, fmt):
+    """
+    Encodes a Pillow image in a format of FORMATS.
+
+    Returns:
+        bytes: Encoded image
+    """
+    import io
+
+    if fmt == "jpeg" and image.mode != "RGB":
+        image = image.convert("RGB")
+
+    buffered = io.BytesIO()
+    image.save(buffered, format=fmt.upper(), **FORMATS[fmt][2])
+    return buffered.getvalue()
+
+def fit(source, size):
+    """
+    Recipe that scales an image down to fit in a box, keeping its aspect ratio.
+
+    Args:
+        source (PIL.Image.Image): Source image
+        size (tuple): Box (width, height) in pixels
+
+    Returns:
+        PIL.Image.Image: Scaled image
+    """
+    from PIL import Image
+
+    image = source.copy()
+    image.thumbnail(size, Image.Resampling.LANCZOS)
+    return image
+
+def thumbnails(source_path, size, recipe=fit, fallback="png"):
+    """
+    Returns every variant of a thumbnail, rendering the ones not cached yet.
+
+    Args:
+        source_path (str): Path to the source image
+        size (tuple): Display (width, height) in CSS pixels; recipes may return
+            a smaller image, e.g. to keep the aspect ratio
+        recipe (callable): Renders a Pillow image at a size from the source image
+        fallback (str): Format every browser can show, "png" or "jpeg"
+
+    Returns:
+        list: Variants, one per format and scale
+
+    Raises:
+        OSError: If the source can't be read or a missing thumbnail can't be rendered
+    """
+    with open(source_path, "rb") as source_file:
+        source_hash = hashlib.sha256(source_file.read()).hexdigest()
+
+    variants = []
+    source = None
+    for fmt in (*MODERN_FORMATS, fallback):
+        for scale in SCALES:
+            target = (size[0] * scale, size[1] * scale)
+            path = _cache_path(source_hash, recipe.__name__, target, fmt)
+
+            try:
+                with open(path, "rb") as cached:
+                    data = cached.read()
+            except OSError:
+                # Pillow is only loaded when something has to be rendered
+                from PIL import Image
+
+                if source is None:
+                    source = Image.open(source_path)
+                    source.load()
+                data = _encode(recipe(source, target), fmt)
+                _write_cache_file(path, data)
+
+            with _used_lock:
+                _used.add(os.path.basename(path))
+            variants.append(Variant(fmt, scale, data))
+
+    return variants
+
+def _write_cache_file(path, data):
+    """Writes a cache file, through a temporary file so readers never see a partial one."""
+    os.makedirs(THUMBNAIL_CACHE_DIR, exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "wb") as cache_file:
+        cache_file.write(data)
+    os.replace(temp_path, path)
+
+def _cached_size(data):
+    """
+    Returns the pixel size of an encoded image, reading its header once per process.
+
+    Only the fallback formats, PNG and JPEG, are sized; their headers are
+    parsed directly, so no Pillow is needed.
+
+    Returns:
+        tuple: (width, height)
+    """
+    key = hashlib.sha256(data).digest()
+    if key not in _sizes:
+        if data[:8] == b"\x89PNG\r\n\x1a\n":
+            _sizes[key] = (int.from_bytes(data[16:20], "big"), int.from_bytes(data[20:24], "big"))
+        else:
+            _sizes[key] = _jpeg_size(data)
+    return _sizes[key]
+
+def _jpeg_size(data):
+    """
+    Returns the pixel size from a JPEG's start-of-frame marker.
+
+    Returns:
+        tuple: (width, height), or None if data is not a JPEG
+    """
+    if data[:2] != b"\xff\xd8":
+        return None
+
+    offset = 2
+    while offset + 9 < len(data):
+        marker, length = data[offset + 1], int.from_bytes(data[offset + 2:offset + 4], "big")
+        # SOF0..SOF15, except DHT (C4), JPG (C8) and DAC (CC)
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            return (int.from_bytes(data[offset + 7:offset + 9], "big"),
+                    int.from_bytes(data[offset + 5:offset + 7], "big"))
+        offset += 2 + length
+    return None
+
+def picture_tag(name, variants, style="", fallback="png"):
+    """
+    Builds an HTML element showing the smallest variant the browser supports.
+
+    With static serving, every format is listed in a <picture>, smallest
+    first, each with its 1x and 2x file; the browser takes the first format
+    it can show and the density that fits the screen. Inlined as data URIs,
+    listing every variant would multiply the payload, so only the 2x
+    variant of the fallback format is sent, which every browser can show.
+
+    The element is returned in two parts around the alt text, so callers
+    can fill it in per use.
+
+    Args:
+        name (str): Asset name, used for static file names, e.g. "team-hearts"
+        variants (list): Variants from ``thumbnails``
+        style (str): Inline CSS of the img element
+        fallback (str): Format of the variants used by the img element itself
+
+    Returns:
+        tuple: (tag start, tag end)
+    """
+    by_format = {}
+    for variant in variants:
+        by_format.setdefault(variant.format, {})[variant.scale] = variant.data
+
+    def url(fmt, scale):
+        extension, mime_type = FORMATS[fmt][:2]
+        return asset_url(f"{name}@{scale}x", by_format[fmt][scale], extension, mime_type)
+
+    def srcset(fmt):
+        return ", ".join(f"{url(fmt, scale)} {scale}x" for scale in SCALES)
+
+    # Size of the 1x variant, so the browser reserves the space before loading
+    width, height = _cached_size(by_format[fallback][1])
+    style_attr = f' style="{html.escape(style)}"' if style else ""
+
+    if not static_serving_enabled():
+        return (
+            f'<img src="{url(fallback, SCALES[-1])}" width="{width}" height="{height}"{style_attr} alt="',
+            '">'
+        )
+
+    sources = sorted(
+        (fmt for fmt in by_format if fmt != fallback),
+        key=lambda fmt: sum(len(data) for data in by_format[fmt].values())
+    )
+    source_tags = "".join(
+        f'<source type="{FORMATS[fmt][1]}" srcset="{srcset(fmt)}">' for fmt in sources
+    )
+    return (
+        f'<picture>{source_tags}<img src="{url(fallback, 1)}" srcset="{srcset(fallback)}" '
+        f'width="{width}" height="{height}"{style_attr} alt="',
+        '"></picture>'
+    )
+
+def rebuild():
+    """
+    Renders every thumbnail the app uses and removes unused cache entries.
+
+    Returns:
+        tuple: (number of cache files kept, number removed)
+    """
+    from assets.card_images import card_back_thumbnails
+    from assets.team_logos import team_logo_thumbnails
+
+    card_back_thumbnails()
+    team_logo_thumbnails()
+
+    removed = 0
+    for filename in os.listdir(THUMBNAIL_CACHE_DIR):
+        if filename not in _used:
+            os.remove(os.path.join(THUMBNAIL_CACHE_DIR, filename))
+            removed += 1
+    return len(_used), removed
+
+if __name__ == "__main__":
+    # Run through the imported module, whose cache records the thumbnails the app uses
+    from assets import thumbnails as pipeline
+
+    kept, removed = pipeline.rebuild()
+    print(f"{kept} thumbnails cached in {THUMBNAIL_CACHE_DIR}, {removed} unused removed")
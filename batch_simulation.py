@@ -0,0 +1,202 @@
+"""
+Vectorized batch race simulation with NumPy.
+
+Runs many races at once as arrays, following the same rules as
+game_logic: a drawn card moves its racecar forward, a checkpoint is flipped
+once every racecar has reached it, and the card drawn for it moves the
+matching racecar forward (horizontal) or back (vertical) one position.
+
+Only the suit of a card affects a race, so instead of shuffling decks each
+race tracks how many cards of every suit are left in its deck and draws a
+suit with probability proportional to those counts. This is the same
+distribution as popping cards off a shuffled deck. Suits are indices 0-3 in
+the order of ``game_logic.SUITS``.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from game_logic import SUITS, FINISH_LINE, CHECKPOINTS, CARDS_PER_SUIT
+
+# Whether the checkpoint at each position is vertical, indexed by position
+VERTICAL = np.array(
+    [False] + [CHECKPOINTS[pos] == "vertical" for pos in range(1, FINISH_LINE)]
+)
+
+# Outcome of a batch of races, one entry per race
+BatchResult = namedtuple("BatchResult", [
+    "winners",           # (N,) suit index of the winning racecar
+    "draws",             # (N,) cards drawn, checkpoint cards included
+    "checkpoint_suits"   # (N, 12) suit revealed at each checkpoint, -1 if not flipped here
+])
+
+def draw_suits(remaining, total, rng, rows=None):
+    """
+    Draw one card from each selected deck.
+
+    Args:
+        remaining (numpy.ndarray): (4, K) cards left per suit (modified in place).
+            Empty decks are refilled first, like the reshuffle in ``draw_card``.
+        total (numpy.ndarray): (K,) cards left per deck (modified in place)
+        rng (numpy.random.Generator): Random source
+        rows (numpy.ndarray, optional): Indices of the decks to draw from; all decks if None
+
+    Returns:
+        tuple: (suit index per drawn card, flat index of each suit/race pair
+            into (4, K) arrays)
+    """
+    if rows is None:
+        rows = slice(None)
+        columns = np.arange(remaining.shape[1])
+    else:
+        columns = rows
+
+    left = total[rows]
+    empty = left == 0
+    if empty.any():
+        refill = columns[empty]
+        remaining[:, refill] = CARDS_PER_SUIT
+        total[refill] = left[empty] = CARDS_PER_SUIT * len(SUITS)
+
+    # Pick a card uniformly among those left and find its suit by counting
+    # the suits whose cards all come before it
+    card = (rng.random(columns.size) * left).astype(np.int16)
+    below = remaining[0, rows].astype(np.int16)
+    suits = (card >= below).astype(np.intp)
+    for suit in range(1, len(SUITS) - 1):
+        below += remaining[suit, rows]
+        suits += card >= below
+
+    flat = suits * remaining.shape[1] + columns
+    remaining.reshape(-1)[flat] -= 1
+    total[rows] = left - 1
+
+    return suits, flat
+
+def run_batch(positions, next_checkpoint, remaining, rng):
+    """
+    Play a batch of races to the finish.
+
+    Args:
+        positions (numpy.ndarray): (N, 4) starting positions
+        next_checkpoint (numpy.ndarray): (N,) lowest unflipped checkpoint per race,
+            13 once all are flipped
+        remaining (numpy.ndarray): (N, 4) cards left per suit in each deck
+        rng (numpy.random.Generator): Random source
+
+    Returns:
+        BatchResult: Winners, draw counts and checkpoint outcomes
+    """
+    n = positions.shape[0]
+    winners = np.full(n, -1, dtype=np.int8)
+    draws = np.zeros(n, dtype=np.int16)
+    checkpoint_suits = np.full((n, FINISH_LINE - 1), -1, dtype=np.int8)
+
+    # Working copies hold only the races still running, one row per suit
+    # so per-race reductions over the four cars stay cheap
+    race_ids = np.arange(n)
+    positions = np.ascontiguousarray(positions.T, dtype=np.int8)
+    remaining = np.ascontiguousarray(remaining.T, dtype=np.int8)
+    next_checkpoint = next_checkpoint.astype(np.int8)
+    total = remaining.sum(axis=0, dtype=np.int16)
+    drawn = np.zeros(n, dtype=np.int16)
+    finished = (positions >= FINISH_LINE).any(axis=0)
+
+    while True:
+        if finished.any():
+            # The first suit in track order on the finish line wins
+            winners[race_ids[finished]] = (positions[:, finished] >= FINISH_LINE).argmax(axis=0)
+            draws[race_ids[finished]] = drawn[finished]
+
+            running = ~finished
+            race_ids = race_ids[running]
+            positions = positions.compress(running, axis=1)
+            remaining = remaining.compress(running, axis=1)
+            next_checkpoint = next_checkpoint[running]
+            total = total[running]
+            drawn = drawn[running]
+        if not race_ids.size:
+            break
+
+        # Draw a card and move the matching racecar
+        _, flat = draw_suits(remaining, total, rng)
+        drawn += 1
+        cars = positions.reshape(-1)
+        cars[flat] = np.minimum(cars[flat] + 1, FINISH_LINE)
+
+        # Flip checkpoints in order while every car has reached the next one;
+        # a forward effect can raise the slowest car and flip the next checkpoint too.
+        # Past checkpoint 12 this never matches, as all cars on 13 would have won.
+        slowest = np.minimum(
+            np.minimum(positions[0], positions[1]),
+            np.minimum(positions[2], positions[3])
+        )
+        rows = np.flatnonzero(slowest >= next_checkpoint)
+        while rows.size:
+            checkpoint = next_checkpoint[rows]
+            suits, flat = draw_suits(remaining, total, rng, rows)
+            drawn[rows] += 1
+            checkpoint_suits[race_ids[rows], checkpoint - 1] = suits
+
+            affected = cars[flat]
+            cars[flat] = np.where(
+                VERTICAL[checkpoint],
+                np.maximum(affected - 1, 0),
+                np.minimum(affected + 1, FINISH_LINE)
+            )
+            next_checkpoint[rows] += 1
+
+            slowest = np.minimum(
+                np.minimum(positions[0, rows], positions[1, rows]),
+                np.minimum(positions[2, rows], positions[3, rows])
+            )
+            rows = rows[slowest >= next_checkpoint[rows]]
+
+        leader = np.maximum(
+            np.maximum(positions[0], positions[1]),
+            np.maximum(positions[2], positions[3])
+        )
+        finished = leader >= FINISH_LINE
+
+    return BatchResult(winners=winners, draws=draws, checkpoint_suits=checkpoint_suits)
+
+def simulate_races(n, seed=None, chunk_size=250_000):
+    """
+    Simulate many races from a fresh start.
+
+    Args:
+        n (int): Number of races
+        seed (int, optional): Seed for reproducible batches
+        chunk_size (int): Races simulated per chunk, bounding memory use
+
+    Returns:
+        BatchResult: Per-race winners, draw counts and checkpoint outcomes
+    """
+    rng = np.random.default_rng(seed)
+    results = []
+
+    for start in range(0, n, chunk_size):
+        size = min(chunk_size, n - start)
+        results.append(run_batch(
+            np.zeros((size, len(SUITS)), dtype=np.int8),
+            np.ones(size, dtype=np.int8),
+            np.full((size, len(SUITS)), CARDS_PER_SUIT, dtype=np.int8),
+            rng
+        ))
+
+    if len(results) == 1:
+        return results[0]
+    return BatchResult(*(np.concatenate(parts) for parts in zip(*results)))
+
+def win_counts(result):
+    """
+    Count wins per suit in a batch result.
+
+    Args:
+        result (BatchResult): Result of ``run_batch`` or ``simulate_races``
+
+    Returns:
+        dict: Suit -> number of races won
+    """
+    counts = np.bincount(result.winners, minlength=len(SUITS))
+    return {suit: int(count) for suit, count in zip(SUITS, counts)}
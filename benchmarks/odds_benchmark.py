@@ -0,0 +1,72 @@
+"""
+Compare the exact odds solver with Monte Carlo estimates on time and accuracy.
+
+Run from the repository root:
+
+    python -m benchmarks.odds_benchmark
+"""
+import random
+import time
+
+from game_logic import (
+    initialize_game,
+    draw_card,
+    move_horse,
+    check_checkpoint,
+    check_winner,
+    card_suit
+)
+from odds import state_key, monte_carlo_win_probabilities, exact_win_probabilities, clear_exact_cache
+
+SAMPLE_SIZES = [5_000, 20_000, 100_000]
+
+def sample_states(count=20, seed=7):
+    """Play seeded races and keep the state after a random number of draws."""
+    rng = random.Random(seed)
+    keys = [state_key(initialize_game(record_events=False, rng=rng))]
+
+    while len(keys) < count:
+        game_state = initialize_game(record_events=False, rng=rng)
+        for _ in range(rng.randrange(1, 45)):
+            card = draw_card(game_state)
+            move_horse(game_state, card_suit(card))
+            check_checkpoint(game_state)
+            if check_winner(game_state):
+                break
+        else:
+            keys.append(state_key(game_state))
+
+    return keys
+
+def main():
+    keys = sample_states()
+
+    clear_exact_cache()
+    start = time.perf_counter()
+    exact_win_probabilities(keys[0])
+    elapsed = time.perf_counter() - start
+    print(f"exact, cold cache from the start: {elapsed:.3f} s, {clear_exact_cache()} states")
+
+    start = time.perf_counter()
+    for key in keys[1:]:
+        clear_exact_cache()
+        exact_win_probabilities(key)
+    print(f"exact, cold cache mid-race: {(time.perf_counter() - start) / (len(keys) - 1) * 1e3:.1f} ms/state")
+
+    exact = [exact_win_probabilities(key)[0] for key in keys]
+    start = time.perf_counter()
+    exact = [exact_win_probabilities(key)[0] for key in keys]
+    print(f"exact, warm cache: {(time.perf_counter() - start) / len(keys) * 1e6:.1f} us/state")
+
+    for races in SAMPLE_SIZES:
+        start = time.perf_counter()
+        estimates = [monte_carlo_win_probabilities(key, races) for key in keys]
+        elapsed = (time.perf_counter() - start) / len(keys)
+
+        errors = [abs(estimate[suit] - solved[suit])
+                  for estimate, solved in zip(estimates, exact) for suit in solved]
+        print(f"monte carlo, {races} races: {elapsed * 1e3:.1f} ms/state, "
+              f"mean abs error {sum(errors) / len(errors):.4f}, max abs error {max(errors):.4f}")
+
+if __name__ == "__main__":
+    main()
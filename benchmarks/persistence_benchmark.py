@@ -0,0 +1,105 @@
+"""
+Check that saving tables to SQLite doesn't slow down draws.
+
+Plays the same draws on tables with and without a store and compares the
+latency of a draw as the app does it (draw under the table lock, then
+mark the table as changed), while the writer thread flushes in the
+background. Also times a flush of every table, which happens off the
+draw path, and checks that the registry's memory accounting stays exact
+while tables are evicted and brought back. Run from the repository root:
+
+    python -m benchmarks.persistence_benchmark
+"""
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from game_logic import initialize_game, draw_cards, SUITS
+from tables import TableRegistry
+from persistence import GameStore
+
+TABLES = 50
+PLAYERS_PER_TABLE = 100
+DRAWS = 20_000
+
+def open_tables(registry, seed=3):
+    """Open started tables with a full party each."""
+    rng = random.Random(seed)
+    tables = []
+    for _ in range(TABLES):
+        table = registry.create()
+        for index in range(PLAYERS_PER_TABLE):
+            table.players.add(f"Player {index}", rng.choice(SUITS), rng.randint(1, 5))
+        table.game_state = initialize_game(rng=random.Random(rng.random()))
+        table.game_initialized = True
+        tables.append(table)
+    return tables
+
+def draw_latencies(registry, tables, seed=5):
+    """Draw one card at a time on random tables; returns the seconds per draw."""
+    rng = random.Random(seed)
+    latencies = []
+    for _ in range(DRAWS):
+        table = rng.choice(tables)
+        start = time.perf_counter()
+        with table.lock:
+            if table.winner:
+                table.game_state = initialize_game()
+                table.drawn_cards = []
+                table.winner = None
+            cards, winner = draw_cards(table.game_state, 1)
+            table.drawn_cards.extend(cards)
+            table.winner = winner
+        registry.save(table)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+def report(label, latencies):
+    latencies = sorted(latencies)
+    p50 = latencies[len(latencies) // 2]
+    p99 = latencies[int(len(latencies) * 0.99)]
+    print(f"{label}: p50 {p50 * 1e6:.1f} us, p99 {p99 * 1e6:.1f} us, "
+          f"mean {statistics.fmean(latencies) * 1e6:.1f} us per draw")
+
+def check_memory_accounting(store):
+    """Evict and bring back tables under a small budget; memory used must match the table sizes."""
+    # Room for a handful of the tables, so most of them are evicted and brought back
+    registry = TableRegistry(memory_budget=200_000, store=store)
+    tables = open_tables(registry)
+    for table in tables:
+        registry.attach(table.table_id)
+    stats = registry.stats()
+    assert stats["evicted"] > 0, "budget too large to evict anything"
+    assert stats["memory_used"] == sum(stats["table_sizes"].values()), \
+        f"memory used {stats['memory_used']} != table sizes {sum(stats['table_sizes'].values())}"
+    print(f"memory accounting: {stats['tables']} tables in memory, {stats['evicted']} evictions, "
+          f"{stats['memory_used']:,} B used, matches the table sizes")
+
+def main():
+    registry = TableRegistry()
+    report("in memory only", draw_latencies(registry, open_tables(registry)))
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = GameStore(os.path.join(directory, "games.sqlite3"))
+        registry = TableRegistry(store=store)
+        tables = open_tables(registry)
+        store.flush()
+        report("with write-behind store", draw_latencies(registry, tables))
+
+        # Change every table so the flush has to write all of them
+        for table in tables:
+            with table.lock:
+                table.players.update(0, stakes=table.players[0]["stakes"] + 1)
+            registry.save(table)
+        start = time.perf_counter()
+        store.flush()
+        print(f"flush of {TABLES} changed tables ({PLAYERS_PER_TABLE} players each), "
+              f"off the draw path: {(time.perf_counter() - start) * 1e3:.1f} ms")
+
+        check_memory_accounting(store)
+        store.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Measure the cold start of the app: what a fresh process pays before the
+first page is sent, and again before the first game board.
+
+Each sample runs in a new interpreter so nothing is cached in memory. Run
+from the repository root:
+
+    python -m benchmarks.startup_benchmark
+"""
+import os
+import ast
+import json
+import statistics
+import subprocess
+import sys
+
+RUNS = 10
+
+# Modules whose import time is worth keeping off the setup page
+HEAVY_MODULES = ["numpy", "PIL", "pandas"]
+
+# Script whose start is measured
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+def app_imports(path=APP_PATH):
+    """
+    Returns the imports app.py does before it renders anything, as code.
+
+    Read from app.py's module-level import statements, including those in
+    try blocks, so the list can't drift from the app. Imports inside
+    functions are left out: they are deferred on purpose.
+
+    Returns:
+        str: One ``import <module>`` line per module, in the app's order
+    """
+    with open(path, encoding="utf-8") as source:
+        statements = list(ast.parse(source.read()).body)
+
+    modules = []
+    while statements:
+        node = statements.pop(0)
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            modules.append(node.module)
+        elif isinstance(node, (ast.Try, ast.If)):
+            statements[:0] = node.body
+    return "".join(f"import {module}\n" for module in dict.fromkeys(modules))
+
+# Imports done by app.py before it renders anything
+APP_IMPORTS = app_imports()
+
+# Work the first rerun of a game adds on top of the setup page
+FIRST_BOARD = """
+from game_logic import initialize_game
+from odds import state_key, monte_carlo_win_probabilities
+from assets.card_images import get_card_back
+from assets.team_logos import team_logo_registry
+get_card_back()
+team_logo_registry()
+monte_carlo_win_probabilities(state_key(initialize_game()))
+"""
+
+SAMPLE = """
+import time, json
+start = time.perf_counter()
+{imports}
+setup = time.perf_counter()
+{first_board}
+board = time.perf_counter()
+print(json.dumps({{"setup": setup - start, "board": board - setup}}))
+"""
+
+def sample():
+    """Start a fresh interpreter and time the app's imports and first board."""
+    code = SAMPLE.format(imports=APP_IMPORTS, first_board=FIRST_BOARD)
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return json.loads(output.stdout.splitlines()[-1])
+
+def loaded_at_setup():
+    """Returns the heavy modules already imported once app.py's imports are done."""
+    code = APP_IMPORTS + f"import sys; print(' '.join(n for n in {HEAVY_MODULES!r} if n in sys.modules))"
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return output.stdout.split()
+
+def main():
+    samples = [sample() for _ in range(RUNS)]
+    setup = [s["setup"] for s in samples]
+    board = [s["board"] for s in samples]
+
+    print(f"app imports (setup page): median {statistics.median(setup) * 1e3:.0f} ms, "
+          f"max {max(setup) * 1e3:.0f} ms over {RUNS} cold starts")
+    print(f"first game board on top: median {statistics.median(board) * 1e3:.0f} ms, "
+          f"max {max(board) * 1e3:.0f} ms")
+    print(f"heavy modules loaded by the app imports: {', '.join(loaded_at_setup()) or 'none'}")
+
+if __name__ == "__main__":
+    main()
@@ -1,221 +1,641 @@
 import random
+import struct
+from array import array
+from collections import deque
+from itertools import islice
+from types import MappingProxyType
 
-def initialize_game():
-    """Initialize the game state with default positions and checkpoints."""
-    game_state = {
-        # Track positions of each "horse" (card suit)
-        "positions": {
-            "hearts": 0,   # Start at position 0
-            "diamonds": 0,
-            "clubs": 0,
-            "spades": 0
-        },
-        # Define checkpoints and their types
-        "checkpoints": {
-            1: "horizontal",   # Move back one position
-            2: "horizontal",   # Move back one position  
-            3: "horizontal",   # Move back one position
-            4: "vertical",     # Move back to start
-            5: "horizontal",   # Move back one position
-            6: "horizontal",   # Move back one position
-            7: "horizontal",   # Move back one position
-            8: "vertical",     # Move back to start
-            9: "horizontal",   # Move back one position
-            10: "horizontal",  # Move back one position
-            11: "horizontal",  # Move back one position
-            12: "vertical"     # Move back to start
-        },
-        # Track which checkpoints have been flipped and which cards they hold
-        "flipped_checkpoints": set(),
-        "checkpoint_cards": {},
+# Card suits, each one a racecar, in track order
+SUITS = ["hearts", "diamonds", "clubs", "spades"]
+
+# Index of each suit in SUITS, used to address per-suit arrays
+SUIT_INDEX = {suit: index for index, suit in enumerate(SUITS)}
+
+# Card values in a deck without aces (the aces make up the track)
+VALUES = ["2", "3", "4", "5", "6", "7", "8", "9", "10", "jack", "queen", "king"]
+
+# Cards are stored as ints: suit index * CARDS_PER_SUIT + value index
+CARDS_PER_SUIT = len(VALUES)
+
+# Position of the finish line; the start is position 0
+FINISH_LINE = 13
+
+# Checkpoint positions and their types, shared by every game
+CHECKPOINTS = MappingProxyType({
+    1: "horizontal",   # Move forward one position
+    2: "horizontal",   # Move forward one position
+    3: "horizontal",   # Move forward one position
+    4: "vertical",     # Move back one position
+    5: "horizontal",   # Move forward one position
+    6: "horizontal",   # Move forward one position
+    7: "horizontal",   # Move forward one position
+    8: "vertical",     # Move back one position
+    9: "horizontal",   # Move forward one position
+    10: "horizontal",  # Move forward one position
+    11: "horizontal",  # Move forward one position
+    12: "vertical"     # Move back one position
+})
+
+# Marks a checkpoint without a card in GameState.checkpoint_cards
+NO_CARD = -1
+
+# Number of animation events kept per game; older ones are evicted
+EVENT_LOG_SIZE = 128
+
+class EventLog:
+    """
+    Bounded stream of animation events with sequence numbers.
+
+    Events are numbered from 1 in the order they are appended. Only the
+    newest ``maxlen`` events are kept, and readers ask for the events after
+    the last sequence number they have handled.
+    """
+    __slots__ = ("events", "last_seq")
+
+    def __init__(self, maxlen=EVENT_LOG_SIZE):
+        self.events = deque(maxlen=maxlen)
+        self.last_seq = 0
+
+    def __len__(self):
+        return len(self.events)
+
+    def append(self, event):
+        """Add an event, evicting the oldest one when the log is full."""
+        self.events.append(event)
+        self.last_seq += 1
+
+    def since(self, seq):
+        """
+        Return the events newer than a sequence number, oldest first.
+
+        Events already evicted are skipped. A sequence number ahead of the log
+        (e.g. acknowledged in a previous game) counts as having seen nothing.
+
+        Args:
+            seq (int): Last sequence number the reader has handled
+
+        Returns:
+            list: Events with a sequence number above ``seq``
+        """
+        if seq > self.last_seq:
+            seq = 0
+        new = min(self.last_seq - seq, len(self.events))
+        return list(islice(self.events, len(self.events) - new, None))
+
+    def copy(self):
+        """Return an independent copy of the log."""
+        log = EventLog(self.events.maxlen)
+        log.events.extend(self.events)
+        log.last_seq = self.last_seq
+        return log
+
+class GameState:
+    """
+    State of one race.
+
+    Positions, checkpoint cards and the deck are compact arrays indexed by
+    suit index and checkpoint position; flipped checkpoints are a bitmask with
+    bit ``position - 1`` set once that checkpoint is flipped. The checkpoint
+    layout is the shared, read-only CHECKPOINTS table.
+    """
+    __slots__ = (
+        "positions",             # array of positions, indexed like SUITS
+        "flipped",               # bitmask of flipped checkpoints
+        "checkpoint_cards",      # array of cards per checkpoint (position - 1), NO_CARD if none
+        "deck",                  # array of cards left, drawn from the end
+        "animation_events",      # EventLog of animation events, or None when not recorded
+        "rng"                    # random source for reshuffles, or None for the random module
+    )
+
+    checkpoints = CHECKPOINTS
+
+    # Header of to_bytes: positions, flipped mask, checkpoint cards
+    _HEADER = struct.Struct(f"<{len(SUITS)}bH{len(CHECKPOINTS)}b")
+
+    def __init__(self, positions, flipped, checkpoint_cards, deck,
+                 animation_events=None, rng=None):
+        self.positions = positions
+        self.flipped = flipped
+        self.checkpoint_cards = checkpoint_cards
+        self.deck = deck
+        self.animation_events = animation_events
+        self.rng = rng
+
+    def position(self, suit):
+        """Return the position of a suit's racecar."""
+        return self.positions[SUIT_INDEX[suit]]
+
+    def is_flipped(self, checkpoint):
+        """Return whether the checkpoint at a position has been flipped."""
+        return bool(self.flipped >> (checkpoint - 1) & 1)
+
+    def next_checkpoint(self):
+        """
+        Return the lowest unflipped checkpoint, or FINISH_LINE once all are flipped.
+
+        Checkpoints flip in order, so this is the lowest clear bit of the mask.
+        """
+        flipped = self.flipped
+        return (~flipped & (flipped + 1)).bit_length()
+
+    def checkpoint_card(self, checkpoint):
+        """Return the card revealed at a checkpoint, or None if it hasn't been flipped."""
+        card = self.checkpoint_cards[checkpoint - 1]
+        return None if card == NO_CARD else card
+
+    def copy(self):
+        """
+        Return an independent copy for forking the race.
+
+        The animation event log is copied too; the random source is shared.
+        """
+        return GameState(
+            array("b", self.positions),
+            self.flipped,
+            array("b", self.checkpoint_cards),
+            array("b", self.deck),
+            None if self.animation_events is None else self.animation_events.copy(),
+            self.rng
+        )
+
+    def to_bytes(self):
+        """Serialize the race to bytes; animation events and the random source are not kept."""
+        return self._HEADER.pack(
+            *self.positions, self.flipped, *self.checkpoint_cards
+        ) + self.deck.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data, record_events=True, rng=None):
+        """
+        Restore a race serialized with ``to_bytes``.
+
+        Args:
+            data (bytes): Serialized game state
+            record_events (bool): Whether the restored game records animation events
+            rng (random.Random, optional): Random source for reshuffles
+
+        Returns:
+            GameState: The restored game state
+        """
+        fields = cls._HEADER.unpack_from(data)
+        suits = len(SUITS)
+        deck = array("b")
+        deck.frombytes(data[cls._HEADER.size:])
+
+        return cls(
+            array("b", fields[:suits]),
+            fields[suits],
+            array("b", fields[suits + 1:]),
+            deck,
+            EventLog() if record_events else None,
+            rng
+        )
+
+def initialize_game(record_events=True, rng=None):
+    """
+    Initialize the game state with default positions and checkpoints.
+
+    Args:
+        record_events (bool): Whether draws and moves should append animation
+            events. Headless simulations pass False to skip building them.
+        rng (random.Random, optional): Random source used for shuffling the deck.
+            Defaults to the module-level ``random`` functions.
+
+    Returns:
+        GameState: The new game state
+    """
+    return GameState(
+        # Every racecar starts at position 0
+        positions=array("b", [0] * len(SUITS)),
+        # No checkpoints flipped and no cards on them
+        flipped=0,
+        checkpoint_cards=array("b", [NO_CARD] * len(CHECKPOINTS)),
         # The deck of cards (excluding aces which are used for the track)
-        "deck": create_deck(),
-        # Track animation events
-        "animation_events": [],
-        # Track whether animations have been processed
-        "animations_processed": False
-    }
-    
-    return game_state
+        deck=create_deck(rng),
+        # Track animation events (None disables event recording)
+        animation_events=EventLog() if record_events else None,
+        rng=rng
+    )
 
-def create_deck():
-    """Create a deck of cards without aces."""
-    suits = ["hearts", "diamonds", "clubs", "spades"]
-    values = ["2", "3", "4", "5", "6", "7", "8", "9", "10", "jack", "queen", "king"]
-    
-    deck = [f"{value} of {suit}" for suit in suits for value in values]
-    random.shuffle(deck)
+def card_suit(card):
+    """Return the suit of a card, e.g. "hearts"."""
+    return SUITS[card // CARDS_PER_SUIT]
+
+def card_value(card):
+    """Return the value of a card, e.g. "jack"."""
+    return VALUES[card % CARDS_PER_SUIT]
+
+def card_name(card):
+    """Return the display name of a card, e.g. "jack of hearts"."""
+    return f"{card_value(card)} of {card_suit(card)}"
+
+def create_deck(rng=None):
+    """
+    Create a deck of cards without aces.
+
+    Args:
+        rng (random.Random, optional): Random source used for shuffling
+
+    Returns:
+        array: Shuffled cards as ints (see ``card_name``)
+    """
+    deck = array("b", range(len(SUITS) * CARDS_PER_SUIT))
+    (rng or random).shuffle(deck)
     
     return deck
 
 def draw_card(game_state):
     """Draw a card from the deck."""
     # If deck is empty, create a new shuffled deck
-    if not game_state["deck"]:
-        game_state["deck"] = create_deck()
+    if not game_state.deck:
+        game_state.deck = create_deck(game_state.rng)
     
-    card = game_state["deck"].pop()
+    card = game_state.deck.pop()
     
     # Track card draw animation
-    if "animation_events" not in game_state:
-        game_state["animation_events"] = []
-    
-    # Get suit of the drawn card
-    card_parts = card.split(" of ")
-    if len(card_parts) == 2:
-        suit = card_parts[1].lower()
-        
-        game_state["animation_events"].append({
+    if game_state.animation_events is not None:
+        game_state.animation_events.append({
             "event": "draw_card",
             "card": card,
-            "suit": suit
+            "suit": card_suit(card)
         })
     
     return card
 
 def move_horse(game_state, suit):
     """Move a horse forward one position."""
+    positions = game_state.positions
+    index = SUIT_INDEX[suit]
+    
     # Save the old position for animation tracking
-    old_position = game_state["positions"][suit]
+    old_position = positions[index]
     
     # Only move forward if the horse hasn't finished
-    if game_state["positions"][suit] < 13:  # Finish line is at position 13
-        game_state["positions"][suit] += 1
+    if old_position < FINISH_LINE:
+        positions[index] = old_position + 1
         
     # Track this movement for animations
-    if "animation_events" not in game_state:
-        game_state["animation_events"] = []
-    
-    game_state["animation_events"].append({
-        "event": "move",
-        "suit": suit,
-        "direction": "forward",
-        "from_position": old_position,
-        "to_position": game_state["positions"][suit]
-    })
+    if game_state.animation_events is not None:
+        game_state.animation_events.append({
+            "event": "move",
+            "suit": suit,
+            "direction": "forward",
+            "from_position": old_position,
+            "to_position": positions[index]
+        })
 
 def check_checkpoint(game_state):
-    """Check if any checkpoints should be flipped and apply their effects."""
-    positions = game_state["positions"]
-    checkpoints = game_state["checkpoints"]
-    flipped_checkpoints = game_state["flipped_checkpoints"]
-    checkpoint_cards = game_state["checkpoint_cards"]
-    
-    # Initialize animation events if needed
-    if "animation_events" not in game_state:
-        game_state["animation_events"] = []
-    
-    # Check each checkpoint
-    for checkpoint_pos, checkpoint_type in checkpoints.items():
-        # If checkpoint is not flipped yet
-        if checkpoint_pos not in flipped_checkpoints:
-            # Check if all horses have passed or are at the checkpoint
-            all_passed_or_at = all(pos >= checkpoint_pos for pos in positions.values())
-            
-            if all_passed_or_at:
-                # Flip the checkpoint and draw a card for it
-                flipped_checkpoints.add(checkpoint_pos)
-                
-                # Track checkpoint flip animation
-                game_state["animation_events"].append({
-                    "event": "flip_checkpoint",
-                    "checkpoint_position": checkpoint_pos
-                })
-                
-                # Draw a card to determine which horse is affected
-                checkpoint_card = draw_card(game_state)
-                checkpoint_cards[checkpoint_pos] = checkpoint_card
-                
-                # Get suit of drawn card
-                card_parts = checkpoint_card.split(" of ")
-                affected_suit = card_parts[1].lower()
-                
-                # Track card reveal animation
-                game_state["animation_events"].append({
-                    "event": "reveal_card",
-                    "checkpoint_position": checkpoint_pos,
-                    "card": checkpoint_card
-                })
-                
-                # Save the old position for animation tracking
-                old_position = positions[affected_suit]
+    """
+    Check if any checkpoints should be flipped and apply their effects.
+    
+    A checkpoint flips once all horses have passed or are at it, so
+    checkpoints flip in order and only the lowest unflipped one can be
+    reached. Its effect may move the slowest horse onto the next one, which
+    is then checked as well.
+    """
+    positions = game_state.positions
+    checkpoint_cards = game_state.checkpoint_cards
+    checkpoint_pos = game_state.next_checkpoint()
+    
+    # Nothing to flip until the slowest horse reaches the next checkpoint
+    if min(positions) < checkpoint_pos:
+        return
+    
+    # Animation events (None when recording is disabled)
+    events = game_state.animation_events
+    
+    # Check the next checkpoint while all horses have passed or are at it
+    while checkpoint_pos < FINISH_LINE and min(positions) >= checkpoint_pos:
+        checkpoint_type = game_state.checkpoints[checkpoint_pos]
+        
+        # Flip the checkpoint and draw a card for it
+        game_state.flipped |= 1 << (checkpoint_pos - 1)
+        
+        # Track checkpoint flip animation
+        if events is not None:
+            events.append({
+                "event": "flip_checkpoint",
+                "checkpoint_position": checkpoint_pos
+            })
+        
+        # Draw a card to determine which horse is affected
+        checkpoint_card = draw_card(game_state)
+        checkpoint_cards[checkpoint_pos - 1] = checkpoint_card
+        
+        # Get suit of drawn card
+        affected_index = checkpoint_card // CARDS_PER_SUIT
+        affected_suit = SUITS[affected_index]
+        
+        # Track card reveal animation
+        if events is not None:
+            events.append({
+                "event": "reveal_card",
+                "checkpoint_position": checkpoint_pos,
+                "card": checkpoint_card
+            })
+        
+        # Save the old position for animation tracking
+        old_position = positions[affected_index]
+        
+        # Apply checkpoint effect
+        if checkpoint_type == "horizontal":
+            # Move forward one position if not at finish
+            if old_position < FINISH_LINE:
+                positions[affected_index] = old_position + 1
                 
-                # Apply checkpoint effect
-                if checkpoint_type == "horizontal":
-                    # Move forward one position if not at finish
-                    if positions[affected_suit] < 13:  # 13 is the finish line
-                        positions[affected_suit] += 1
-                        
-                        # Track forward movement animation
-                        game_state["animation_events"].append({
-                            "event": "move",
-                            "suit": affected_suit,
-                            "direction": "forward",
-                            "from_position": old_position,
-                            "to_position": positions[affected_suit]
-                        })
-                elif checkpoint_type == "vertical":
-                    # Move back one checkpoint (instead of back to start)
-                    # Calculate the new position (one checkpoint back)
-                    new_position = max(0, positions[affected_suit] - 1)
-                    positions[affected_suit] = new_position
-                    
-                    # Track backward movement animation
-                    game_state["animation_events"].append({
+                # Track forward movement animation
+                if events is not None:
+                    events.append({
                         "event": "move",
                         "suit": affected_suit,
-                        "direction": "backward",
+                        "direction": "forward",
                         "from_position": old_position,
-                        "to_position": new_position
+                        "to_position": old_position + 1
                     })
+        elif checkpoint_type == "vertical":
+            # Move back one checkpoint (instead of back to start)
+            # Calculate the new position (one checkpoint back)
+            new_position = max(0, old_position - 1)
+            positions[affected_index] = new_position
+            
+            # Track backward movement animation
+            if events is not None:
+                events.append({
+                    "event": "move",
+                    "suit": affected_suit,
+                    "direction": "backward",
+                    "from_position": old_position,
+                    "to_position": new_position
+                })
+        
+        checkpoint_pos += 1
 
 def check_winner(game_state):
     """Check if any horse has reached the finish line."""
-    positions = game_state["positions"]
-    
-    for suit, position in positions.items():
-        if position >= 13:  # Position 13 is the finish line
+    for suit, position in zip(SUITS, game_state.positions):
+        if position >= FINISH_LINE:
             return suit
     
     return None
 
-def reset_game(keep_players=True):
+def play_turn(game_state):
+    """
+    Play one turn: draw a card, move its horse and resolve checkpoints.
+    
+    Args:
+        game_state (GameState): Game state to play (modified in place)
+        
+    Returns:
+        tuple: (card drawn for the turn, winning suit or None)
+    """
+    card = draw_card(game_state)
+    move_horse(game_state, card_suit(card))
+    check_checkpoint(game_state)
+    return card, check_winner(game_state)
+
+def coalesce_events(events):
+    """
+    Merge the animation events of several turns into one short timeline.
+    
+    Checkpoint flips and reveals are kept in order, each horse's moves
+    collapse into one move from its first to its last position, and only
+    the last card draw is kept.
+    
+    Args:
+        events (list): Animation events in the order they happened
+        
+    Returns:
+        list: Coalesced animation events
+    """
+    timeline = []
+    moves = {}
+    last_draw = None
+    
+    for event in events:
+        if event["event"] == "move":
+            suit = event["suit"]
+            if suit in moves:
+                moves[suit]["to_position"] = event["to_position"]
+            else:
+                moves[suit] = dict(event)
+        elif event["event"] == "draw_card":
+            last_draw = event
+        else:
+            timeline.append(event)
+    
+    if last_draw is not None:
+        timeline.insert(0, last_draw)
+    
+    for move in moves.values():
+        if move["to_position"] != move["from_position"]:
+            move["direction"] = "forward" if move["to_position"] > move["from_position"] else "backward"
+            timeline.append(move)
+    
+    return timeline
+
+def draw_cards(game_state, n=None):
+    """
+    Play several turns in one step, stopping early if a horse wins.
+    
+    When more than one turn is played, their animation events are coalesced
+    into a single timeline before they are added to the event log.
+    
+    Args:
+        game_state (GameState): Game state to play (modified in place)
+        n (int, optional): Maximum number of turns; None plays until a horse wins
+        
+    Returns:
+        tuple: (list of cards drawn for the turns, winning suit or None)
+    """
+    # Collect this batch's events separately so they can be coalesced
+    log = game_state.animation_events
+    collect = log is not None and n != 1
+    if collect:
+        game_state.animation_events = []
+    
+    cards = []
+    winner = check_winner(game_state)
+    while winner is None and (n is None or len(cards) < n):
+        card, winner = play_turn(game_state)
+        cards.append(card)
+    
+    if collect:
+        events = game_state.animation_events
+        game_state.animation_events = log
+        for event in coalesce_events(events) if len(cards) > 1 else events:
+            log.append(event)
+    
+    return cards, winner
+
+# Winners hand out this many times their own stakes
+PAYOUT_MULTIPLIER = 2
+
+class PlayerRoster:
+    """
+    Players and their bets, indexed by the racecar they bet on.
+
+    Players are dicts with "name", "horse" (suit) and "stakes", kept in the
+    order they joined. Every suit keeps its own players and stake total,
+    updated on each add, edit and remove, so winners, stake totals and
+    payouts never scan the whole party. Change players through the roster
+    only; editing a player dict directly bypasses the index.
+
+    ``revision`` goes up with every change, so code that refers to players
+    by position can tell whether the positions it saw still hold.
+    """
+    __slots__ = (
+        "players",       # list of player dicts, in joining order
+        "by_suit",       # per suit index: dict of id(player) -> player, in betting order
+        "suit_stakes",   # array of stake totals, indexed like SUITS
+        "revision"       # number of changes made to the roster so far
+    )
+
+    def __init__(self, players=()):
+        self.players = []
+        self.by_suit = [{} for _ in SUITS]
+        self.suit_stakes = array("q", [0] * len(SUITS))
+        self.revision = 0
+        for player in players:
+            self.add(player["name"], player["horse"], player["stakes"])
+
+    def __len__(self):
+        return len(self.players)
+
+    def __iter__(self):
+        return iter(self.players)
+
+    def __getitem__(self, index):
+        return self.players[index]
+
+    @property
+    def total_stakes(self):
+        """Total stakes of all players."""
+        return sum(self.suit_stakes)
+
+    def add(self, name, suit, stakes):
+        """
+        Add a player at the end of the roster.
+
+        Args:
+            name (str): Player name
+            suit (str): Suit of the racecar the player bets on
+            stakes (int): Slurker bet
+
+        Returns:
+            dict: The new player
+        """
+        player = {"name": name, "horse": suit, "stakes": stakes}
+        self.players.append(player)
+        self._index(player)
+        self.revision += 1
+        return player
+
+    def remove(self, index):
+        """
+        Remove the player at a position in the roster.
+
+        Args:
+            index (int): Position of the player
+
+        Returns:
+            dict: The removed player
+        """
+        player = self.players.pop(index)
+        self._unindex(player)
+        self.revision += 1
+        return player
+
+    def update(self, index, name=None, suit=None, stakes=None):
+        """
+        Change a player's name, racecar or stakes; arguments left as None are kept.
+
+        Args:
+            index (int): Position of the player
+            name (str, optional): New name
+            suit (str, optional): Suit of the new racecar
+            stakes (int, optional): New slurker bet
+        """
+        player = self.players[index]
+        if name is not None:
+            player["name"] = name
+        if stakes is not None:
+            self.suit_stakes[SUIT_INDEX[player["horse"]]] += stakes - player["stakes"]
+            player["stakes"] = stakes
+        if suit is not None and suit != player["horse"]:
+            self._unindex(player)
+            player["horse"] = suit
+            self._index(player)
+        self.revision += 1
+
+    def clear(self):
+        """Remove every player."""
+        self.players.clear()
+        for players in self.by_suit:
+            players.clear()
+        for index in range(len(SUITS)):
+            self.suit_stakes[index] = 0
+        self.revision += 1
+
+    def bettors(self, suit):
+        """Return the players who bet on a suit's racecar, in the order they bet on it."""
+        return list(self.by_suit[SUIT_INDEX[suit]].values())
+
+    def stakes_on(self, suit):
+        """Return the total stakes bet on a suit's racecar."""
+        return self.suit_stakes[SUIT_INDEX[suit]]
+
+    def payouts(self, suit):
+        """
+        Return the drinks each winner hands out if a suit's racecar wins.
+
+        Args:
+            suit (str): Suit of the winning racecar
+
+        Returns:
+            list: (player, slurker to hand out) for every player who bet on it
+        """
+        return [(player, player["stakes"] * PAYOUT_MULTIPLIER) for player in self.bettors(suit)]
+
+    def _index(self, player):
+        suit_index = SUIT_INDEX[player["horse"]]
+        self.by_suit[suit_index][id(player)] = player
+        self.suit_stakes[suit_index] += player["stakes"]
+
+    def _unindex(self, player):
+        suit_index = SUIT_INDEX[player["horse"]]
+        del self.by_suit[suit_index][id(player)]
+        self.suit_stakes[suit_index] -= player["stakes"]
+
+def reset_game(keep_players=True, table=None):
     """
     Reset the game state.
     
     Args:
         keep_players (bool): Whether to keep the player list for the next game
+        table (tables.Table, optional): Table to reset; defaults to the game
+            kept in the session state
     """
-    if 'game_initialized' in st.session_state:
-        st.session_state.game_initialized = False
+    # Imported lazily so the rules above can run without Streamlit installed
+    import streamlit as st
+    
+    state = st.session_state if table is None else table
     
-    if 'game_state' in st.session_state:
-        st.session_state.game_state = None
+    if hasattr(state, 'game_initialized'):
+        state.game_initialized = False
     
-    if 'drawn_cards' in st.session_state:
-        st.session_state.drawn_cards = []
+    if hasattr(state, 'game_state'):
+        state.game_state = None
     
-    if 'winner' in st.session_state:
-        st.session_state.winner = None
+    if hasattr(state, 'drawn_cards'):
+        state.drawn_cards = []
+    
+    if hasattr(state, 'winner'):
+        state.winner = None
+    
+    # What this session's board has been sent
+    if 'animation_ack' in st.session_state:
+        st.session_state.animation_ack = 0
     
     # Keep player information if requested
-    if not keep_players:
-        if 'players' in st.session_state:
-            st.session_state.players = []
-        
-        if 'total_stakes' in st.session_state:
-            st.session_state.total_stakes = 0
-    else:
-        # Ensure total_stakes is calculated correctly
-        if 'players' in st.session_state and 'total_stakes' in st.session_state:
-            # Recalculate total stakes based on current players
-            total = sum(player['stakes'] for player in st.session_state.players)
-            st.session_state.total_stakes = total
-
-# This import is needed for the reset_game function
-# Placed at the bottom to avoid circular imports
-try:
-    import streamlit as st
-except ImportError:
-    # For handling LSP checks where streamlit might not be available
-    pass
+    if not keep_players and hasattr(state, 'players'):
+        state.players.clear()
@@ -0,0 +1,259 @@
+"""
+Debug instrumentation for app reruns.
+
+Enabled per session by opening the app with ``?debug=1``. app.py marks the
+start of each section of the page with ``section(name)``; every message the
+rerun sends to the browser is counted against the current section, and the
+time until the next section starts is added to it. The totals are shown in
+a sidebar panel and printed as one log line at the end of the rerun, along
+with a rolling p50/p95 of each section's time over the last reruns.
+
+Set ``RERUN_PROFILE_LOG`` to a file path to also append every rerun to it
+as one JSON line.
+"""
+import os
+import json
+import time
+from collections import deque
+
+try:
+    import streamlit as st
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+except ImportError:
+    # For handling LSP checks where streamlit might not be available
+    pass
+
+# Reruns kept per section for the rolling percentiles
+ROLLING_WINDOW = 200
+
+# JSONL file every profiled rerun is appended to, if set
+PROFILE_LOG = os.environ.get("RERUN_PROFILE_LOG")
+
+class PayloadCounter:
+    """
+    Wraps a session's message queue and counts the bytes sent per section.
+
+    Attributes:
+        enqueue (callable): The session's original enqueue function
+        current (str): Section messages are counted against, or None to not count
+        sizes (dict): Section -> bytes sent in the current rerun
+    """
+    __slots__ = ("enqueue", "current", "sizes")
+
+    def __init__(self, enqueue):
+        self.enqueue = enqueue
+        self.current = None
+        self.sizes = {}
+
+    def __call__(self, msg):
+        if self.current is not None:
+            self.sizes[self.current] = self.sizes.get(self.current, 0) + msg.ByteSize()
+        self.enqueue(msg)
+
+def debug_enabled():
+    """
+    Returns whether debug instrumentation is on for this session.
+
+    Returns:
+        bool: True if the app was opened with ?debug=1
+    """
+    return st.query_params.get("debug") == "1"
+
+class RerunTimer:
+    """
+    Times the sections of a rerun and keeps a rolling history per section.
+
+    Attributes:
+        started (float): perf_counter() at the start of the rerun
+        current (str): Section being timed, or None
+        section_started (float): perf_counter() at the start of the current section
+        times (dict): Section -> seconds spent in the current rerun
+        history (dict): Section -> deque of its seconds in the last reruns
+    """
+    __slots__ = ("started", "current", "section_started", "times", "history")
+
+    def __init__(self):
+        self.started = 0.0
+        self.current = None
+        self.section_started = 0.0
+        self.times = {}
+        self.history = {}
+
+    def begin(self):
+        self.started = time.perf_counter()
+        self.current = None
+        self.times = {}
+
+    def switch(self, name):
+        """Closes the current section and starts timing the next one."""
+        now = time.perf_counter()
+        if self.current is not None:
+            self.times[self.current] = self.times.get(self.current, 0.0) + now - self.section_started
+        self.current = name
+        self.section_started = now
+
+    def finish(self):
+        """
+        Closes the rerun and adds its section times to the history.
+
+        Returns:
+            float: Wall time of the rerun in seconds
+        """
+        self.switch(None)
+        for name, seconds in self.times.items():
+            self.history.setdefault(name, deque(maxlen=ROLLING_WINDOW)).append(seconds)
+        return time.perf_counter() - self.started
+
+    def percentiles(self, name):
+        """
+        Returns the rolling p50 and p95 of a section's time.
+
+        Args:
+            name (str): Section name
+
+        Returns:
+            tuple: (p50, p95) in seconds
+        """
+        samples = sorted(self.history[name])
+        last = len(samples) - 1
+        return samples[round(last * 0.5)], samples[round(last * 0.95)]
+
+def _counter():
+    """
+    Returns the payload counter of this rerun, or None if it can't be counted.
+    """
+    return st.session_state.get("_payload_counter")
+
+def _timer():
+    """
+    Returns the timer of this session, or None if instrumentation is off.
+    """
+    return st.session_state.get("_rerun_timer") if debug_enabled() else None
+
+def begin_rerun():
+    """
+    Starts measuring a rerun when debug instrumentation is on.
+
+    The payload counter is installed once on the session's script run
+    context, which is reused across reruns, and removed again with the
+    first rerun without ``?debug=1``. The timer lives in the session state
+    so its history survives reruns.
+
+    Counting bytes relies on a private Streamlit API: the counter replaces
+    the context's ``_enqueue`` function. If a Streamlit release doesn't
+    have it, bytes are not counted and only times are measured.
+    """
+    st.session_state._payload_counter = None
+    ctx = get_script_run_ctx()
+    enqueue = getattr(ctx, "_enqueue", None)
+
+    if not debug_enabled():
+        if isinstance(enqueue, PayloadCounter):
+            ctx._enqueue = enqueue.enqueue
+        return
+
+    if "_rerun_timer" not in st.session_state:
+        st.session_state._rerun_timer = RerunTimer()
+    st.session_state._rerun_timer.begin()
+
+    if enqueue is None:
+        return
+
+    counter = enqueue
+    if not isinstance(counter, PayloadCounter):
+        counter = PayloadCounter(enqueue)
+        ctx._enqueue = counter
+
+    counter.current = None
+    counter.sizes = {}
+    st.session_state._payload_counter = counter
+
+def section(name):
+    """
+    Marks the start of a section of the page; the previous one ends here.
+
+    Args:
+        name (str): Section name, e.g. "board"
+    """
+    counter = _counter()
+    if counter is not None:
+        counter.current = name
+
+    timer = _timer()
+    if timer is not None:
+        timer.switch(name)
+
+def _finish(timer, counter, cut_short):
+    """
+    Closes the measurement of a rerun and writes its log line and JSONL record.
+
+    Returns:
+        tuple: (wall time in seconds, section -> bytes)
+    """
+    wall = timer.finish()
+    # Whatever is sent after this is not part of the measured payload
+    sizes = {}
+    if counter is not None:
+        counter.current = None
+        sizes = counter.sizes
+
+    print(
+        f"rerun {wall * 1000:.1f} ms, payload {sum(sizes.values())} B"
+        + (" (cut short)" if cut_short else "") + ": "
+        + ", ".join(
+            f"{name}={seconds * 1000:.1f}ms/{sizes.get(name, 0)}B"
+            for name, seconds in timer.times.items()
+        )
+    )
+
+    if PROFILE_LOG:
+        record = {
+            "time": time.time(),
+            "wall_ms": round(wall * 1000, 3),
+            "cut_short": cut_short,
+            "sections": {
+                name: {"ms": round(seconds * 1000, 3), "bytes": sizes.get(name, 0)}
+                for name, seconds in timer.times.items()
+            },
+        }
+        with open(PROFILE_LOG, "a") as f:
+            f.write(json.dumps(record) + "\n")
+
+    return wall, sizes
+
+def rerun():
+    """
+    Records the rerun so far and restarts the script, like st.rerun().
+
+    The rerun that handles a click ends early in st.rerun(), so without this
+    the time of the click handler would never be reported. It is logged but
+    not shown, since the sidebar would be thrown away by the restart.
+    """
+    timer = _timer()
+    if timer is not None:
+        _finish(timer, _counter(), cut_short=True)
+    st.rerun()
+
+def end_rerun():
+    """
+    Reports the time and payload of the rerun in the sidebar and as a log line.
+    """
+    timer = _timer()
+    if timer is None:
+        return
+
+    wall, sizes = _finish(timer, _counter(), cut_short=False)
+
+    with st.sidebar.expander("Debug: rerun profile", expanded=True):
+        st.metric("Wall time", f"{wall * 1000:.1f} ms")
+        st.metric("Payload", f"{sum(sizes.values()):,} B")
+
+        names = list(timer.history)
+        rolling = [timer.percentiles(name) for name in names]
+        st.table({
+            "Section": names,
+            "Last ms": [f"{timer.times.get(name, 0.0) * 1000:.1f}" for name in names],
+            "p50 ms": [f"{p50 * 1000:.1f}" for p50, _ in rolling],
+            "p95 ms": [f"{p95 * 1000:.1f}" for _, p95 in rolling],
+            "Bytes": [sizes.get(name, 0) for name in names],
+        })
@@ -0,0 +1,153 @@
+"""
+Win odds for a race in progress.
+
+A race's future only depends on the racecar positions, which checkpoints
+are flipped and how many cards of each suit are left in the deck, so those
+are reduced to a canonical, hashable state key that callers can cache on.
+Odds come either from Monte Carlo simulation or from an exact solver that
+memoizes every state reachable from the key.
+"""
+from functools import lru_cache
+
+from game_logic import SUITS, FINISH_LINE, CHECKPOINTS, CARDS_PER_SUIT
+
+# Cards left per suit right after a reshuffle
+FULL_DECK = (CARDS_PER_SUIT,) * len(SUITS)
+
+# Whether the checkpoint at each position is vertical, indexed by position
+VERTICAL = (False,) + tuple(CHECKPOINTS[pos] == "vertical" for pos in range(1, FINISH_LINE))
+
+def state_key(game_state):
+    """
+    Reduce a game state to the parts that decide the rest of the race.
+
+    Checkpoints flip in order, so the flipped mask is captured by the lowest
+    unflipped checkpoint.
+
+    Args:
+        game_state (GameState): Game state from initialize_game
+
+    Returns:
+        tuple: (positions per suit, next unflipped checkpoint, cards left per suit)
+    """
+    positions = tuple(game_state.positions)
+
+    next_checkpoint = game_state.next_checkpoint()
+
+    remaining = [0] * len(SUITS)
+    for card in game_state.deck:
+        remaining[card // CARDS_PER_SUIT] += 1
+
+    return positions, next_checkpoint, tuple(remaining)
+
+def monte_carlo_win_probabilities(key, races=20_000):
+    """
+    Estimate each racecar's chance of winning by simulating forward.
+
+    The random source is seeded from the state key, so the same state always
+    gives the same estimate.
+
+    Args:
+        key (tuple): State key from ``state_key``
+        races (int): Number of races to simulate
+
+    Returns:
+        dict: Suit -> probability of winning
+    """
+    # NumPy is imported on first use so the app's setup page doesn't load it
+    import numpy as np
+    from batch_simulation import run_batch, win_counts
+
+    positions, next_checkpoint, remaining = key
+    rng = np.random.default_rng([*positions, next_checkpoint, *remaining])
+
+    result = run_batch(
+        np.tile(np.array(positions, dtype=np.int8), (races, 1)),
+        np.full(races, next_checkpoint, dtype=np.int8),
+        np.tile(np.array(remaining, dtype=np.int8), (races, 1)),
+        rng
+    )
+
+    return {suit: wins / races for suit, wins in win_counts(result).items()}
+
+@lru_cache(maxsize=None)
+def _solve(positions, next_checkpoint, remaining):
+    """
+    Exact outcome of the race from a state, memoized on the state itself.
+
+    A checkpoint is pending when every car has reached the next unflipped
+    one; it is resolved before the finish line is checked, as in
+    check_checkpoint followed by check_winner.
+
+    Returns:
+        tuple: (win probability per suit index, expected cards still to draw)
+    """
+    pending = next_checkpoint < FINISH_LINE and min(positions) >= next_checkpoint
+    if not pending and max(positions) >= FINISH_LINE:
+        # The first suit in track order on the finish line wins
+        winner = [position >= FINISH_LINE for position in positions].index(True)
+        return tuple(float(suit == winner) for suit in range(len(SUITS))), 0.0
+
+    total = sum(remaining)
+    if total == 0:
+        # draw_card reshuffles a fresh deck when it runs out
+        remaining = FULL_DECK
+        total = sum(FULL_DECK)
+
+    probabilities = [0.0] * len(SUITS)
+    expected_draws = 1.0
+    for suit, count in enumerate(remaining):
+        if not count:
+            continue
+
+        left = list(remaining)
+        left[suit] -= 1
+        moved = list(positions)
+        checkpoint = next_checkpoint
+
+        if pending:
+            # The card decides which car the checkpoint affects
+            if VERTICAL[checkpoint]:
+                moved[suit] = max(0, moved[suit] - 1)
+            else:
+                moved[suit] = min(FINISH_LINE, moved[suit] + 1)
+            checkpoint += 1
+        else:
+            moved[suit] = min(FINISH_LINE, moved[suit] + 1)
+
+        outcome, draws = _solve(tuple(moved), checkpoint, tuple(left))
+        chance = count / total
+        for winner, probability in enumerate(outcome):
+            probabilities[winner] += chance * probability
+        expected_draws += chance * draws
+
+    return tuple(probabilities), expected_draws
+
+def exact_win_probabilities(key):
+    """
+    Compute each racecar's exact chance of winning and the expected race length.
+
+    Every state reachable from the key is solved once and kept for later
+    calls; the whole race from the start is about 76k states.
+
+    Args:
+        key (tuple): State key from ``state_key``
+
+    Returns:
+        tuple: (dict of suit -> probability of winning,
+            expected number of cards still to be drawn, checkpoint cards included)
+    """
+    positions, next_checkpoint, remaining = key
+    outcome, expected_draws = _solve(tuple(positions), next_checkpoint, tuple(remaining))
+    return dict(zip(SUITS, outcome)), expected_draws
+
+def clear_exact_cache():
+    """
+    Forget every state solved by ``exact_win_probabilities``.
+
+    Returns:
+        int: Number of states that were cached
+    """
+    states = _solve.cache_info().currsize
+    _solve.cache_clear()
+    return states
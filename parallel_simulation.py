@@ -0,0 +1,147 @@
+"""
+Parallel race simulation over a process pool.
+
+Races are split into fixed-size tasks, each with its own seed spawned from
+one root seed, and run with the batch simulator in worker processes. Workers
+send back RaceStats aggregates instead of per-race records, and the
+aggregates are merged as tasks finish. Because seeds are tied to tasks, not
+workers, a seeded run gives the same totals on any number of cores.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from game_logic import SUITS, FINISH_LINE, CHECKPOINTS, CARDS_PER_SUIT
+from batch_simulation import run_batch
+
+# Longest possible race in cards drawn. Until the winning card every car is
+# at most on FINISH_LINE - 1, each move card adds one position and only the
+# vertical checkpoints take one back, so a race draws at most 4 * 12 + 3 + 1
+# move cards, plus one card per checkpoint: 64. The deck is reshuffled when
+# it runs out, so its size is no limit.
+MAX_DRAWS = (
+    len(SUITS) * (FINISH_LINE - 1)
+    + sum(kind == "vertical" for kind in CHECKPOINTS.values()) + 1
+    + len(CHECKPOINTS)
+)
+
+# Races per task handed to a worker
+TASK_SIZE = 250_000
+
+class RaceStats:
+    """
+    Mergeable aggregate statistics over many races.
+
+    Attributes:
+        races (int): Number of races
+        wins (numpy.ndarray): (4,) races won per suit
+        lengths (numpy.ndarray): (MAX_DRAWS + 1,) histogram of cards drawn per race
+        checkpoint_effects (numpy.ndarray): (12, 4) times each checkpoint
+            (row position - 1) hit each suit
+    """
+    __slots__ = ("races", "wins", "lengths", "checkpoint_effects")
+
+    def __init__(self):
+        self.races = 0
+        self.wins = np.zeros(len(SUITS), dtype=np.int64)
+        self.lengths = np.zeros(MAX_DRAWS + 1, dtype=np.int64)
+        self.checkpoint_effects = np.zeros((len(CHECKPOINTS), len(SUITS)), dtype=np.int64)
+
+    @classmethod
+    def from_batch(cls, result):
+        """
+        Aggregate a batch_simulation.BatchResult.
+
+        Args:
+            result (BatchResult): Per-race results
+
+        Returns:
+            RaceStats: Totals over the batch
+        """
+        stats = cls()
+        stats.races = len(result.winners)
+        stats.wins += np.bincount(result.winners, minlength=len(SUITS))
+        stats.lengths += np.bincount(result.draws, minlength=MAX_DRAWS + 1)
+
+        # Count (checkpoint, suit) pairs over flipped checkpoints only
+        checkpoint_suits = result.checkpoint_suits
+        flipped = checkpoint_suits >= 0
+        pairs = np.nonzero(flipped)[1] * len(SUITS) + checkpoint_suits[flipped]
+        stats.checkpoint_effects += np.bincount(
+            pairs, minlength=stats.checkpoint_effects.size
+        ).reshape(stats.checkpoint_effects.shape)
+
+        return stats
+
+    def merge(self, other):
+        """Add another aggregate into this one and return self."""
+        self.races += other.races
+        self.wins += other.wins
+        self.lengths += other.lengths
+        self.checkpoint_effects += other.checkpoint_effects
+        return self
+
+    def win_probabilities(self):
+        """Return the share of races won per suit."""
+        return {suit: wins / self.races for suit, wins in zip(SUITS, self.wins.tolist())}
+
+    def mean_length(self):
+        """Return the average number of cards drawn per race."""
+        return float(np.arange(self.lengths.size) @ self.lengths) / self.races
+
+def simulate_task(races, seed_sequence):
+    """
+    Simulate races from a fresh start in a worker.
+
+    Args:
+        races (int): Number of races
+        seed_sequence (numpy.random.SeedSequence): Seed for this task's random stream
+
+    Returns:
+        RaceStats: Aggregates over the task's races
+    """
+    result = run_batch(
+        np.zeros((races, len(SUITS)), dtype=np.int8),
+        np.ones(races, dtype=np.int8),
+        np.full((races, len(SUITS)), CARDS_PER_SUIT, dtype=np.int8),
+        np.random.default_rng(seed_sequence)
+    )
+    return RaceStats.from_batch(result)
+
+def run_parallel(n, seed=None, workers=None, task_size=TASK_SIZE):
+    """
+    Simulate races on all cores and merge their statistics.
+
+    Args:
+        n (int): Number of races
+        seed (int, optional): Root seed; each task gets an independent child stream
+        workers (int, optional): Worker processes, defaults to the CPU count
+        task_size (int): Races per task
+
+    Returns:
+        RaceStats: Totals over all races
+
+    Raises:
+        ValueError: If n is less than 1
+    """
+    if n < 1:
+        raise ValueError(f"Number of races must be at least 1, got {n}")
+
+    sizes = [min(task_size, n - start) for start in range(0, n, task_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    stats = RaceStats()
+
+    workers = min(workers or os.cpu_count() or 1, len(sizes))
+    if workers == 1:
+        for size, seed_sequence in zip(sizes, seeds):
+            stats.merge(simulate_task(size, seed_sequence))
+        return stats
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        tasks = [pool.submit(simulate_task, size, seed_sequence)
+                 for size, seed_sequence in zip(sizes, seeds)]
+        for task in as_completed(tasks):
+            stats.merge(task.result())
+
+    return stats
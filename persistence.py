@@ -0,0 +1,279 @@
+"""
+SQLite persistence of game tables, so a race survives a server restart.
+
+Saving is write-behind: ``GameStore.save`` only marks a table as changed,
+and a background thread snapshots the changed tables and writes them in one
+transaction every ``flush_interval`` seconds. Draws never wait for the disk,
+and a table changed many times between flushes is written once. Snapshots
+equal to what was last written are skipped. The database runs in WAL mode,
+so loading a table never waits for a write in progress.
+
+A crash loses at most the last ``flush_interval`` seconds of changes; a
+normal shutdown flushes everything first.
+
+Only tables with players or a started game are kept; an empty table is
+not worth resuming, and every visit without a table link opens one.
+Tables that haven't changed for ``TABLE_RETENTION_DAYS`` are deleted, so
+the database only grows with the tables in actual use.
+"""
+import os
+import json
+import time
+import atexit
+import sqlite3
+import threading
+from array import array
+
+from game_logic import GameState
+from tables import Table
+
+# Database file, overridable with the GAME_DB_PATH environment variable
+GAME_DB_PATH = os.environ.get(
+    "GAME_DB_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'games.sqlite3')
+)
+
+# Seconds between write-behind flushes
+FLUSH_INTERVAL = 0.5
+
+# Days a table is kept after its last change, overridable with the
+# TABLE_RETENTION_DAYS environment variable
+TABLE_RETENTION_DAYS = float(os.environ.get("TABLE_RETENTION_DAYS", 30))
+
+# Seconds between deletions of expired tables by the writer thread
+PRUNE_INTERVAL = 3600
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS game_tables (
+    table_id TEXT PRIMARY KEY,
+    game_initialized INTEGER NOT NULL,
+    game_state BLOB,
+    drawn_cards BLOB NOT NULL,
+    winner TEXT,
+    horse_names TEXT NOT NULL,
+    players TEXT NOT NULL,
+    updated REAL NOT NULL
+)
+"""
+
+def snapshot(table):
+    """
+    Serialize a table to a database row.
+
+    Args:
+        table (Table): Table to serialize
+
+    Returns:
+        tuple: Values for the game_tables columns, without the update time
+    """
+    with table.lock:
+        game_state = table.game_state
+        return (
+            table.table_id,
+            int(table.game_initialized),
+            None if game_state is None else game_state.to_bytes(),
+            array("b", table.drawn_cards).tobytes(),
+            table.winner,
+            json.dumps(table.horse_names),
+            json.dumps([[player["name"], player["horse"], player["stakes"]] for player in list(table.players)]),
+        )
+
+def restore(row):
+    """
+    Rebuild a table from a database row written by ``snapshot``.
+
+    Args:
+        row (tuple): Values of the game_tables columns
+
+    Returns:
+        Table: The restored table
+    """
+    table_id, game_initialized, game_state, drawn_cards, winner, horse_names, players = row[:7]
+
+    table = Table(table_id)
+    table.game_initialized = bool(game_initialized)
+    table.game_state = None if game_state is None else GameState.from_bytes(game_state)
+    cards = array("b")
+    cards.frombytes(drawn_cards)
+    table.drawn_cards = cards.tolist()
+    table.winner = winner
+    table.horse_names = json.loads(horse_names)
+    for name, suit, stakes in json.loads(players):
+        table.players.add(name, suit, stakes)
+    return table
+
+class GameStore:
+    """
+    Tables saved to SQLite by a background writer thread.
+    """
+    def __init__(self, path=GAME_DB_PATH, flush_interval=FLUSH_INTERVAL,
+                 retention_days=TABLE_RETENTION_DAYS):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.retention_days = retention_days
+
+        # Tables changed since the last flush, by ID
+        self._dirty = {}
+        self._dirty_lock = threading.Lock()
+        # Hash of the row last written per table, used by the writer thread only
+        self._written = {}
+        # Events of flush() calls waiting for the next flush to finish
+        self._waiting = []
+        self._wake = threading.Event()
+        self._closed = False
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(SCHEMA)
+        conn.close()
+
+        self._writer = threading.Thread(target=self._run, name="game-store-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10)
+        # WAL only needs the log synced at checkpoints to stay consistent
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def save(self, table):
+        """
+        Mark a table as changed; it is written with the next flush.
+
+        Args:
+            table (Table): Changed table
+        """
+        with self._dirty_lock:
+            self._dirty[table.table_id] = table
+
+    def load(self, table_id):
+        """
+        Read a table from the database.
+
+        A table with changes that haven't been written yet is returned as
+        is, since the database only has an older copy of it.
+
+        Args:
+            table_id (str): ID of the table
+
+        Returns:
+            Table: The table, or None if it was never saved
+        """
+        with self._dirty_lock:
+            pending = self._dirty.get(table_id)
+        if pending is not None:
+            return pending
+
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT table_id, game_initialized, game_state, drawn_cards, winner, horse_names, players "
+                "FROM game_tables WHERE table_id = ?", (table_id,)
+            ).fetchone()
+        finally:
+            conn.close()
+        return None if row is None else restore(row)
+
+    def exists(self, table_id):
+        """Return whether a table with this ID was ever saved."""
+        conn = self._connect()
+        try:
+            return conn.execute(
+                "SELECT 1 FROM game_tables WHERE table_id = ?", (table_id,)
+            ).fetchone() is not None
+        finally:
+            conn.close()
+
+    def flush(self):
+        """Write every changed table now and wait until it is on disk."""
+        done = threading.Event()
+        with self._dirty_lock:
+            self._waiting.append(done)
+        self._wake.set()
+        done.wait()
+
+    def close(self):
+        """Flush the remaining changes and stop the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self._writer.join()
+
+    def _run(self):
+        conn = self._connect()
+        # Expired tables are deleted once at startup, then every PRUNE_INTERVAL
+        next_prune = 0
+        try:
+            while True:
+                if time.monotonic() >= next_prune:
+                    try:
+                        self._prune(conn)
+                    except sqlite3.Error as e:
+                        print(f"Error deleting expired game tables: {e}")
+                    next_prune = time.monotonic() + PRUNE_INTERVAL
+
+                self._wake.wait(self.flush_interval)
+                self._wake.clear()
+                closing = self._closed
+                try:
+                    self._write_pending(conn)
+                except sqlite3.Error as e:
+                    print(f"Error saving game tables: {e}")
+                if closing:
+                    break
+        finally:
+            conn.close()
+
+    def _prune(self, conn):
+        """Delete the tables that haven't changed within the retention period."""
+        cutoff = time.time() - self.retention_days * 24 * 3600
+        with conn:
+            expired = [row[0] for row in conn.execute(
+                "SELECT table_id FROM game_tables WHERE updated < ?", (cutoff,)
+            )]
+            conn.execute("DELETE FROM game_tables WHERE updated < ?", (cutoff,))
+        # A table still in use is written again with its next change
+        for table_id in expired:
+            self._written.pop(table_id, None)
+
+    def _write_pending(self, conn):
+        """Snapshot the changed tables and write the ones that differ, in one transaction."""
+        with self._dirty_lock:
+            pending, self._dirty = self._dirty, {}
+            waiting, self._waiting = self._waiting, []
+
+        try:
+            rows = []
+            for table_id, table in pending.items():
+                row = snapshot(table)
+                # An empty table is deleted rather than written: no started game, no players
+                digest = None if not row[1] and row[6] == "[]" else hash(row)
+                if table_id not in self._written or self._written[table_id] != digest:
+                    rows.append((row, digest))
+
+            if rows:
+                now = time.time()
+                with conn:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO game_tables VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        [row + (now,) for row, digest in rows if digest is not None]
+                    )
+                    conn.executemany(
+                        "DELETE FROM game_tables WHERE table_id = ?",
+                        [(row[0],) for row, digest in rows if digest is None]
+                    )
+                for row, digest in rows:
+                    self._written[row[0]] = digest
+        except sqlite3.Error:
+            # Try again with the next flush, unless the table changed again since
+            with self._dirty_lock:
+                for table_id, table in pending.items():
+                    self._dirty.setdefault(table_id, table)
+            raise
+        finally:
+            # Callers of flush() are released even if the write failed
+            for done in waiting:
+                done.set()
@@ -0,0 +1,70 @@
+"""
+Headless race simulation.
+
+Plays complete races with the rules from game_logic without touching
+Streamlit, so it can run in scripts and worker processes.
+"""
+import random
+from collections import namedtuple
+
+from game_logic import (
+    initialize_game,
+    draw_card,
+    move_horse,
+    check_checkpoint,
+    check_winner,
+    card_suit
+)
+
+# Compact outcome of a single race
+RaceResult = namedtuple("RaceResult", [
+    "winner",            # Suit of the winning racecar
+    "draws",             # Number of cards drawn from the deck, checkpoint cards included
+    "checkpoint_cards",  # Card revealed at each checkpoint (index position - 1), NO_CARD if not flipped
+    "animation_events"   # EventLog, or None unless requested
+])
+
+def play_race(game_state):
+    """
+    Draw cards until a racecar wins.
+
+    Args:
+        game_state (GameState): Game state to play forward (modified in place)
+
+    Returns:
+        tuple: (winner suit, number of cards drawn)
+    """
+    draws = 0
+    winner = check_winner(game_state)
+
+    while winner is None:
+        # Every flipped checkpoint draws one extra card
+        flipped_before = game_state.flipped.bit_count()
+        card = draw_card(game_state)
+        move_horse(game_state, card_suit(card))
+        check_checkpoint(game_state)
+        winner = check_winner(game_state)
+        draws += 1 + game_state.flipped.bit_count() - flipped_before
+
+    return winner, draws
+
+def simulate_race(seed=None, record_events=False):
+    """
+    Play one full race from a fresh deck.
+
+    Args:
+        seed (int, optional): Seed for the race's random source, for reproducible races
+        record_events (bool): Whether to build the animation event list
+
+    Returns:
+        RaceResult: Winner, number of draws and checkpoint outcomes
+    """
+    game_state = initialize_game(record_events=record_events, rng=random.Random(seed))
+    winner, draws = play_race(game_state)
+
+    return RaceResult(
+        winner=winner,
+        draws=draws,
+        checkpoint_cards=game_state.checkpoint_cards,
+        animation_events=game_state.animation_events
+    )
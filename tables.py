@@ -0,0 +1,214 @@
+"""
+Game tables shared by every session of the server process.
+
+A table holds one party's game: its players, racecar names, race and drawn
+cards. Browser sessions attach to a table by its ID (the ``?table=`` query
+parameter), so everyone at the table sees and plays the same race. Tables
+live in a process-wide registry that accounts for the memory each one uses
+and evicts the least recently used tables once they exceed the budget.
+With a store (see persistence.py), evicted tables and tables from before a
+restart are loaded back when a session attaches to them.
+"""
+import os
+import sys
+import secrets
+import threading
+import weakref
+from collections import OrderedDict, deque
+
+from game_logic import PlayerRoster, GameState, EventLog
+
+# Memory the registry may use for tables before evicting idle ones, in bytes
+TABLE_MEMORY_BUDGET = int(os.environ.get("TABLE_MEMORY_BUDGET", 32 * 1024 * 1024))
+
+# Racecar names a new table starts with
+DEFAULT_HORSE_NAMES = {
+    'hearts': 'McLaren',
+    'diamonds': 'Mercedes',
+    'clubs': 'Ferrari',
+    'spades': 'Red Bull'
+}
+
+class Table:
+    """
+    One party's game, shared by every session attached to it.
+
+    Hold ``lock`` while changing the race, so two sessions drawing at the
+    same time don't interleave their draws.
+    """
+    __slots__ = (
+        "table_id",          # ID sessions attach with
+        "game_initialized",  # whether the game has started (setup is done)
+        "game_state",        # GameState of the race, or None during setup
+        "players",           # PlayerRoster of the party
+        "drawn_cards",       # list of cards drawn so far
+        "winner",            # suit of the winning racecar, or None
+        "horse_names",       # dict of suit -> racecar name
+        "lock",              # threading.RLock guarding changes to the race
+        "size",              # bytes used, as of the last time it was measured
+        "__weakref__"        # lets the registry find evicted tables still in use
+    )
+
+    def __init__(self, table_id):
+        self.table_id = table_id
+        self.game_initialized = False
+        self.game_state = None
+        self.players = PlayerRoster()
+        self.drawn_cards = []
+        self.winner = None
+        self.horse_names = dict(DEFAULT_HORSE_NAMES)
+        self.lock = threading.RLock()
+        self.size = 0
+
+def deep_size(obj, seen=None):
+    """
+    Estimate the memory used by an object and everything it references.
+
+    Follows the containers and slotted classes a table is built from;
+    shared objects are counted once.
+
+    Args:
+        obj: Object to measure
+        seen (set, optional): IDs of objects already counted
+
+    Returns:
+        int: Size in bytes
+    """
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_size(key, seen) + deep_size(value, seen) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple, set, deque)):
+        size += sum(deep_size(item, seen) for item in obj)
+    elif isinstance(obj, (Table, GameState, EventLog, PlayerRoster)):
+        for slot in type(obj).__slots__:
+            # The lock and the random source are not part of the game's data
+            if slot not in ("lock", "rng"):
+                size += deep_size(getattr(obj, slot, None), seen)
+    # Strings, numbers and arrays are fully counted by getsizeof
+    return size
+
+class TableRegistry:
+    """
+    Process-wide tables by ID, evicted least recently used over a memory budget.
+
+    Each table's size is measured when a session attaches to it, i.e. once
+    per rerun, so it reflects the changes of the table's previous rerun.
+
+    An evicted table that is still referenced, by a session's rerun in
+    progress or by the store waiting to write it, is taken back as is
+    rather than loaded again, so there is never a second copy of a table.
+    """
+    def __init__(self, memory_budget=TABLE_MEMORY_BUDGET, store=None):
+        self.memory_budget = memory_budget
+        self.store = store
+        self.tables = OrderedDict()
+        self.memory_used = 0
+        self.evicted = 0
+        # Evicted tables by ID, for as long as something else still holds them
+        self._evicted_tables = weakref.WeakValueDictionary()
+        self._lock = threading.Lock()
+
+    def create(self):
+        """
+        Open a new table.
+
+        Returns:
+            Table: The new table, with a fresh ID
+        """
+        while True:
+            table_id = secrets.token_hex(3)
+            # Checked outside the registry lock so other sessions don't wait on the disk
+            if self.store is not None and self.store.exists(table_id):
+                continue
+
+            with self._lock:
+                if table_id in self.tables or table_id in self._evicted_tables:
+                    continue
+                table = Table(table_id)
+                self.tables[table_id] = table
+                self._measure(table)
+                self._evict(keep=table)
+            return table
+
+    def attach(self, table_id):
+        """
+        Return a table for a session's rerun and mark it as recently used.
+
+        Args:
+            table_id (str): ID of the table
+
+        Returns:
+            Table: The table, or None if there is none with that ID (anymore)
+        """
+        with self._lock:
+            table = self.tables.get(table_id) or self._evicted_tables.pop(table_id, None)
+            if table is not None:
+                return self._attach(table)
+
+        if self.store is None:
+            return None
+
+        # Open before the server restarted, or evicted and already written;
+        # read outside the registry lock so other sessions don't wait on the disk
+        loaded = self.store.load(table_id)
+        if loaded is None:
+            return None
+
+        with self._lock:
+            # Another session may have brought the table back in the meantime
+            table = self.tables.get(table_id) or self._evicted_tables.pop(table_id, None) or loaded
+            return self._attach(table)
+
+    def _attach(self, table):
+        """Put a table back in the registry as the most recently used one."""
+        self.tables[table.table_id] = table
+        self.tables.move_to_end(table.table_id)
+        self._measure(table)
+        self._evict(keep=table)
+        return table
+
+    def save(self, table):
+        """Persist a table's changes, if the registry has a store."""
+        if self.store is not None:
+            self.store.save(table)
+
+    def stats(self):
+        """
+        Return the registry's memory accounting.
+
+        Returns:
+            dict: Number of tables, bytes used, budget, tables evicted so far
+                and bytes used per table ID, most recently used last
+        """
+        with self._lock:
+            return {
+                "tables": len(self.tables),
+                "memory_used": self.memory_used,
+                "memory_budget": self.memory_budget,
+                "evicted": self.evicted,
+                "table_sizes": {table_id: table.size for table_id, table in self.tables.items()},
+            }
+
+    def _measure(self, table):
+        size = deep_size(table)
+        self.memory_used += size - table.size
+        table.size = size
+
+    def _evict(self, keep):
+        """Drop least recently used tables until the budget is met, never ``keep``."""
+        while self.memory_used > self.memory_budget and len(self.tables) > 1:
+            table_id, table = next(iter(self.tables.items()))
+            if table is keep:
+                break
+            del self.tables[table_id]
+            self._evicted_tables[table_id] = table
+            self.memory_used -= table.size
+            # No longer counted, so it is counted in full if it comes back
+            table.size = 0
+            self.evicted += 1